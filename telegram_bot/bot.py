@@ -506,11 +506,11 @@ Just send me a file and I'll handle everything automatically!
             )
             
             # Generate diagram
-            diagram_path = await self.diagram_service.create_diagram_from_transcript(
-                transcript_content, custom_prompt
+            diagram_png = await self.diagram_service.create_diagram_from_transcript(
+                transcript_content, custom_prompt, return_bytes=True
             )
             
-            if not diagram_path:
+            if not diagram_png:
                 await processing_msg.edit_text(
                     "❌ **Failed to generate diagram**\n\n"
                     "Could not create a diagram from the transcript. This might be due to:\n"
@@ -526,21 +526,18 @@ Just send me a file and I'll handle everything automatically!
                     pass
                 return
             
-            temp_files_to_cleanup.append(diagram_path)
+            # Send the diagram straight from memory
+            caption = "📊 **Diagram Generated!**\n\n"
+            if custom_prompt:
+                caption += f"Based on: {custom_prompt}\n"
+            caption += f"From: {replied_message.document.file_name}"
             
-            # Send the diagram
-            with open(diagram_path, 'rb') as diagram_file:
-                caption = "📊 **Diagram Generated!**\n\n"
-                if custom_prompt:
-                    caption += f"Based on: {custom_prompt}\n"
-                caption += f"From: {replied_message.document.file_name}"
-                
-                await context.bot.send_photo(
-                    chat_id=update.effective_chat.id,
-                    photo=diagram_file,
-                    caption=caption,
-                    parse_mode="Markdown",
-                )
+            await context.bot.send_photo(
+                chat_id=update.effective_chat.id,
+                photo=diagram_png,
+                caption=caption,
+                parse_mode="Markdown",
+            )
             
             # Update processing message with success
             await processing_msg.edit_text(
@@ -55,10 +55,19 @@ class Settings(BaseSettings):
         default="text-embedding-004",
         alias="RAG_EMBEDDING_MODEL",
     )
+    # 0 keeps the model's native size; smaller values store and search truncated vectors
+    rag_embedding_dimensions: int = Field(default=0, alias="RAG_EMBEDDING_DIMENSIONS")
     rag_chunk_size: int = Field(default=400, alias="RAG_CHUNK_SIZE")
     rag_chunk_overlap: int = Field(default=80, alias="RAG_CHUNK_OVERLAP")
+    # Worker threads for upserts; embedding requests run inside them
+    rag_index_workers: int = Field(default=4, alias="RAG_INDEX_WORKERS")
     rag_retrieval_k: int = Field(default=12, alias="RAG_RETRIEVAL_K")
     rag_similarity_threshold: float = Field(default=0.7, alias="RAG_SIMILARITY_THRESHOLD")
+    # Seconds a RAG answer is reused for near-identical questions; 0 disables the answer cache
+    rag_answer_cache_ttl: int = Field(default=3600, alias="RAG_ANSWER_CACHE_TTL")
+    # Chroma server to store vectors in; empty keeps the embedded store under TEMP_DIR
+    chroma_host: str = Field(default="", alias="CHROMA_HOST")
+    chroma_port: int = Field(default=8000, alias="CHROMA_PORT")
 
     # Zoom integration
     zoom_client_id: str = Field(default="", alias="ZOOM_CLIENT_ID")
@@ -5,6 +5,7 @@ from typing import Dict, Optional
 
 from anthropic import AsyncAnthropic
 from google import genai
+from google.genai import types
 from loguru import logger
 
 from telegram_bot.config import get_settings
@@ -14,8 +15,8 @@ class AIModel(ABC):
     """Abstract base class for AI models."""
 
     @abstractmethod
-    async def generate_text(self, prompt: str) -> str | None:
-        """Generate text response from the AI model."""
+    async def generate_text(self, prompt: str, system: str | None = None) -> str | None:
+        """Generate text response from the AI model, with optional static system instructions."""
         pass
 
 
@@ -28,12 +29,16 @@ class GeminiModel(AIModel):
         self.model_name = model_name
         logger.info(f"Initialized Gemini model: {model_name}")
 
-    async def generate_text(self, prompt: str) -> str | None:
+    async def generate_text(self, prompt: str, system: str | None = None) -> str | None:
         """Generate text using Gemini."""
+        kwargs = {}
+        if system:
+            kwargs["config"] = types.GenerateContentConfig(system_instruction=system)
         try:
             response = self.client.models.generate_content(
                 model=self.model_name,
-                contents=[prompt]
+                contents=[prompt],
+                **kwargs,
             )
             return response.text
         except Exception as e:
@@ -50,14 +55,21 @@ class ClaudeModel(AIModel):
         self.model_name = model_name
         logger.info(f"Initialized Claude model: {model_name}")
 
-    async def generate_text(self, prompt: str, max_tokens: int = 8000) -> str | None:
+    async def generate_text(
+        self, prompt: str, max_tokens: int = 8000, system: str | None = None
+    ) -> str | None:
         """Generate text using Claude."""
+        kwargs = {}
+        if system:
+            # Mark the static system block as a cacheable prefix
+            kwargs["system"] = [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
         try:
             message = await self.client.messages.create(
                 model=self.model_name,
                 max_tokens=max_tokens,
                 temperature=0.1,
                 messages=[{"role": "user", "content": prompt}],
+                **kwargs,
             )
             return message.content[0].text
         except Exception as e:
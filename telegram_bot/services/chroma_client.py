@@ -0,0 +1,19 @@
+"""Chroma client shared by the RAG indexing and query services."""
+
+from chromadb import HttpClient, PersistentClient
+from chromadb.api import ClientAPI
+from chromadb.config import Settings
+
+
+def create_chroma_client(path: str, host: str = "", port: int = 8000) -> ClientAPI:
+    """Connect to a Chroma server when a host is configured, else open the embedded store at `path`.
+
+    A server keeps collections and write serialization out of the bot process, so ingests
+    from several workers do not contend on one embedded database.
+    """
+    # Telemetry would add a background HTTP call per client; the settings must match
+    # across services because Chroma shares one embedded client per path
+    settings = Settings(anonymized_telemetry=False, allow_reset=False)
+    if host:
+        return HttpClient(host=host, port=port, settings=settings)
+    return PersistentClient(path=path, settings=settings)
@@ -24,7 +24,7 @@ class DiagramService:
         
         logger.info("Diagram service initialized with Python-only generation")
 
-    async def _create_python_diagram(self, transcript: str, custom_prompt: Optional[str] = None) -> Optional[str]:
+    async def _create_python_diagram(self, transcript: str, custom_prompt: Optional[str] = None, return_bytes: bool = False) -> str | bytes | None:
         """Create a diagram using Python-based generator."""
         try:
             # Clean transcript
@@ -39,33 +39,33 @@ class DiagramService:
             if diagram_type == 'flowchart':
                 nodes, edges = await self.data_extractor.extract_flowchart_data(clean_transcript, custom_prompt)
                 title = "Process Flow" if not custom_prompt else f"Process Flow: {custom_prompt[:30]}"
-                return await self.python_generator.create_flowchart(nodes, edges, title)
+                return await self.python_generator.create_flowchart(nodes, edges, title, return_bytes)
                 
             elif diagram_type == 'relationship':
                 entities, relationships = await self.data_extractor.extract_relationship_data(clean_transcript, custom_prompt)
                 title = "Relationships" if not custom_prompt else f"Relationships: {custom_prompt[:30]}"
-                return await self.python_generator.create_relationship_diagram(entities, relationships, title)
+                return await self.python_generator.create_relationship_diagram(entities, relationships, title, return_bytes)
                 
             elif diagram_type == 'timeline':
                 events = await self.data_extractor.extract_timeline_data(clean_transcript, custom_prompt)
                 title = "Timeline" if not custom_prompt else f"Timeline: {custom_prompt[:30]}"
-                return await self.python_generator.create_timeline_diagram(events, title)
+                return await self.python_generator.create_timeline_diagram(events, title, return_bytes)
                 
             elif diagram_type == 'hierarchy':
                 hierarchy = await self.data_extractor.extract_hierarchy_data(clean_transcript, custom_prompt)
                 title = "Hierarchy" if not custom_prompt else f"Hierarchy: {custom_prompt[:30]}"
-                return await self.python_generator.create_hierarchy_diagram(hierarchy, title)
+                return await self.python_generator.create_hierarchy_diagram(hierarchy, title, return_bytes)
                 
             elif diagram_type == 'chart':
                 chart_data, chart_type = await self.data_extractor.extract_chart_data(clean_transcript, custom_prompt)
                 title = "Data Chart" if not custom_prompt else f"Chart: {custom_prompt[:30]}"
-                return await self.python_generator.create_simple_chart(chart_data, chart_type, title)
+                return await self.python_generator.create_simple_chart(chart_data, chart_type, title, return_bytes)
                 
             else:
                 # Default to flowchart
                 nodes, edges = await self.data_extractor.extract_flowchart_data(clean_transcript, custom_prompt)
                 title = "Process Flow" if not custom_prompt else f"Process Flow: {custom_prompt[:30]}"
-                return await self.python_generator.create_flowchart(nodes, edges, title)
+                return await self.python_generator.create_flowchart(nodes, edges, title, return_bytes)
                 
         except Exception as e:
             logger.error(f"Error creating Python diagram: {e}", exc_info=True)
@@ -93,16 +93,17 @@ class DiagramService:
         
         return ' '.join(cleaned_lines)
 
-    async def create_diagram_from_transcript(self, transcript: str, custom_prompt: Optional[str] = None) -> Optional[str]:
+    async def create_diagram_from_transcript(self, transcript: str, custom_prompt: Optional[str] = None, return_bytes: bool = False) -> str | bytes | None:
         """
         Create a diagram image from transcript using Python-only generation.
 
         Args:
             transcript: The transcript text to analyze
             custom_prompt: Optional custom prompt to guide diagram creation
+            return_bytes: Return the PNG bytes instead of writing a file to /tmp
 
         Returns:
-            Path to the generated image file or None if failed
+            Path to the generated image file (or its PNG bytes) or None if failed
         """
         try:
             if not transcript.strip():
@@ -111,11 +112,11 @@ class DiagramService:
 
             # Use Python-based diagram generator
             logger.info("Generating diagram with Python-only approach...")
-            python_diagram_path = await self._create_python_diagram(transcript, custom_prompt)
+            python_diagram = await self._create_python_diagram(transcript, custom_prompt, return_bytes)
             
-            if python_diagram_path:
-                logger.info(f"Successfully created Python diagram: {python_diagram_path}")
-                return python_diagram_path
+            if python_diagram:
+                logger.info("Successfully created Python diagram")
+                return python_diagram
             else:
                 logger.error("Python diagram generation failed")
                 return None
@@ -1,55 +1,125 @@
 """Embedding function that uses Gemini's embedding API."""
 
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Iterable
 
+import numpy as np
 from google import genai
+from google.genai import types
 from loguru import logger
 
+# The embedding endpoint accepts at most this many inputs per request
+MAX_BATCH_SIZE = 100
+
+# Batch requests in flight at once when embedding more than one batch
+MAX_CONCURRENT_REQUESTS = 4
+
 
 class GeminiEmbeddingFunction:
     """Callable embedding function compatible with ChromaDB."""
 
-    def __init__(self, api_key: str, model_name: str = "text-embedding-004") -> None:
+    def __init__(
+        self,
+        api_key: str,
+        model_name: str = "text-embedding-004",
+        output_dimensionality: int | None = None,
+    ) -> None:
         if not api_key:
             raise ValueError("GOOGLE_API_KEY is required to use Gemini embeddings.")
         self.client = genai.Client(api_key=api_key)
         self.model_name = model_name
+        self.output_dimensionality = output_dimensionality or None
+        self._config = (
+            types.EmbedContentConfig(output_dimensionality=self.output_dimensionality)
+            if self.output_dimensionality
+            else None
+        )
 
     def __call__(self, texts: str | Iterable[str]) -> list[list[float]]:
         inputs = [texts] if isinstance(texts, str) else list(texts)
-        embeddings: list[list[float]] = []
+        embeddings: list[list[float]] = [[] for _ in inputs]
 
-        for text in inputs:
+        # Blank inputs keep an empty embedding; repeated texts (overlapping chunks, shared
+        # summaries) are sent once and fanned back out to every position that holds them
+        positions: dict[str, list[int]] = {}
+        for idx, text in enumerate(inputs):
             normalized = (text or "").strip()
-            if not normalized:
-                embeddings.append([])
-                continue
-
-            try:
-                response = self.client.models.embed_content(
-                    model=self.model_name,
-                    contents=normalized,
-                )
-                embeddings.append(self._extract_embedding(response))
-            except Exception as exc:
-                logger.error("Gemini embedding request failed: {}", exc)
-                embeddings.append([])
+            if normalized:
+                positions.setdefault(normalized, []).append(idx)
+        unique_texts = list(positions)
+        batches = [
+            unique_texts[offset:offset + MAX_BATCH_SIZE]
+            for offset in range(0, len(unique_texts), MAX_BATCH_SIZE)
+        ]
+
+        # Each batch is one HTTP round-trip; large documents sets send several at once
+        if len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(batches))) as executor:
+                results = list(executor.map(self._embed_batch, batches))
+        else:
+            results = [self._embed_batch(batch) for batch in batches]
+
+        for batch, vectors in zip(batches, results, strict=True):
+            # A failed batch has no vectors, so its texts keep their empty embeddings
+            for text, values in zip(batch, vectors or [], strict=False):
+                for idx in positions[text]:
+                    embeddings[idx] = values
 
         return embeddings
 
+    def _embed_batch(self, batch: list[str]) -> list[list[float]] | None:
+        """Embed one request's worth of texts; returns None if the request fails."""
+        try:
+            response = self.client.models.embed_content(
+                model=self.model_name,
+                contents=batch,
+                config=self._config,
+            )
+            vectors = self._extract_embeddings(response, len(batch))
+        except Exception as exc:
+            logger.error("Gemini embedding request failed: {}", exc)
+            return None
+        if self.output_dimensionality:
+            vectors = self._normalize(vectors)
+        return vectors
+
     @staticmethod
-    def _extract_embedding(response: Any) -> list[float]:
-        """Extract embedding vector from Gemini response."""
-        embedding = getattr(response, "embedding", None)
-        if embedding and hasattr(embedding, "values"):
-            return list(embedding.values)
+    def _normalize(vectors: list[list[float]]) -> list[list[float]]:
+        """Rescale truncated embeddings to unit length; only full-size vectors come normalized."""
+        matrix = np.asarray(vectors, dtype=np.float64)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return (matrix / np.where(norms == 0, 1, norms)).tolist()
 
+    @staticmethod
+    def _extract_embeddings(response: Any, expected: int) -> list[list[float]]:
+        """Extract one embedding vector per input from a Gemini response."""
         embeddings = getattr(response, "embeddings", None)
-        if embeddings:
-            candidate = embeddings[0]
-            values = getattr(candidate, "values", None)
-            if values is not None:
-                return list(values)
+        if embeddings is None:
+            embedding = getattr(response, "embedding", None)
+            embeddings = [embedding] if embedding is not None else []
+
+        vectors = [list(item.values) for item in embeddings if getattr(item, "values", None) is not None]
+        if len(vectors) != expected:
+            raise ValueError(
+                f"Gemini embed response included {len(vectors)} embeddings for {expected} inputs."
+            )
+        return vectors
+
 
-        raise ValueError("Gemini embed response did not include embedding values.")
+@functools.lru_cache(maxsize=4)
+def get_embedding_function(
+    api_key: str,
+    model_name: str = "text-embedding-004",
+    output_dimensionality: int | None = None,
+) -> GeminiEmbeddingFunction:
+    """Return the process-wide embedding function for these settings.
 
+    The indexing and query services share one instance, and so one Gemini client and its
+    HTTP connection pool, instead of each building their own.
+    """
+    return GeminiEmbeddingFunction(
+        api_key=api_key,
+        model_name=model_name,
+        output_dimensionality=output_dimensionality,
+    )
@@ -1,26 +1,269 @@
 """Python-based diagram generator for creating visual diagrams from transcripts."""
 
-from datetime import datetime
+import asyncio
+import functools
+import inspect
+import io
+import os
+import re
+import tempfile
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 
+import matplotlib
 import matplotlib.pyplot as plt
 import networkx as nx
+import numpy as np
 import seaborn as sns
 from loguru import logger
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from PIL import Image
+from scipy.sparse.csgraph import shortest_path
 
-# Set matplotlib backend to Agg for headless environments
-plt.switch_backend('Agg')
+try:
+    import igraph as ig
+except ImportError:  # optional: C implementation of force-directed layouts
+    ig = None
 
-# Set style
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
+try:
+    import graph_tool.all as gt
+except ImportError:  # optional: C++/OpenMP multilevel SFDP layout for large graphs
+    gt = None
+
+try:
+    from fa2 import ForceAtlas2
+except ImportError:  # optional: Barnes-Hut ForceAtlas2 for large fallback layouts
+    ForceAtlas2 = None
+
+# Diagrams with this many nodes/events or fewer skip layout algorithms entirely
+TINY_GRAPH_SIZE = 3
+
+# Graphs from this many nodes get the large canvas; above DENSE_GRAPH_SIZE the full DPI
+LARGE_GRAPH_SIZE = 15
+DENSE_GRAPH_SIZE = 30
+
+# Larger graphs are pruned before layout to bound worst-case render time
+MAX_NODES = 300
+
+# Above this many edges arrowheads are skipped and only the line segments are drawn
+MAX_ARROWHEAD_EDGES = 50
+
+# Figure margins in inches: a band on top for the title, a thin border elsewhere
+DIAGRAM_MARGINS = {'left': 0.2, 'right': 0.2, 'top': 0.8, 'bottom': 0.2}
+# Room for the flowchart legend, which sits outside the axes on the right
+LEGEND_MARGINS = {'right': 2.0}
+# Room for axis labels and rotated category ticks on charts
+CHART_MARGINS = {'left': 1.0, 'right': 0.3, 'bottom': 1.5}
+
+# Above this many labelled edges the labels are unreadable, so they are not drawn
+MAX_EDGE_LABELS = 30
+
+# Above this many nodes force-directed fallbacks switch to approximate, cheaper settings
+FORCE_LAYOUT_APPROX_SIZE = 50
+
+# Cyclic flowcharts smaller than this are placed on a circle instead of a force layout
+SMALL_FLOWCHART_SIZE = 8
+
+# Acyclic flowcharts are drawn in layers when neither the depth nor any layer exceeds this
+MAX_FLOWCHART_LAYERS = 8
+
+# Above this many nodes graph-tool's SFDP layout is preferred when installed
+SFDP_LAYOUT_SIZE = 100
+
+# Substrings that mark an entity as a database, service, cache or queue, checked in this
+# order; one pattern per type, since a single scan would consume overlapping keywords
+_ENTITY_TYPE_PATTERNS = tuple(
+    (entity_type, re.compile('|'.join(keywords), re.IGNORECASE))
+    for entity_type, keywords in (
+        ('database', ('db', 'database', 'postgres', 'mysql', 'mongo')),
+        ('service', ('service', 'api', 'endpoint')),
+        ('cache', ('cache', 'redis', 'memcached')),
+        ('queue', ('queue', 'kafka', 'rabbitmq', 'sqs')),
+    )
+)
+
+# networkx 3.5 added an L-BFGS "energy" solver to spring_layout
+_SPRING_HAS_ENERGY_METHOD = 'method' in inspect.signature(nx.spring_layout).parameters
+
+
+@functools.lru_cache(maxsize=64)
+def _husl_palette(n: int) -> Tuple:
+    """Return the HUSL palette with `n` colors, cached per size."""
+    return tuple(sns.color_palette("husl", n))
+
+
+@functools.lru_cache(maxsize=512)
+def _wrap_label(label: str, width: int = 20) -> str:
+    """Break long labels into lines of at most `width` characters, keeping words whole."""
+    return textwrap.fill(label, width=width, break_long_words=False) if len(label) > width else label
+
+
+@functools.lru_cache(maxsize=4096)
+def _truncate_label(label: str, max_length: int = 15, keep: int = 12) -> str:
+    """Shorten long node labels; entity names recur across diagrams, so results are cached."""
+    return label[:keep] + "..." if len(label) > max_length else label
+
+
+@functools.lru_cache(maxsize=4096)
+def _entity_type(entity: str) -> str:
+    """Classify an entity name by keyword; the first type in _ENTITY_TYPE_PATTERNS that matches wins."""
+    return next((t for t, pattern in _ENTITY_TYPE_PATTERNS if pattern.search(entity)), 'primary')
+
+
+@functools.lru_cache(maxsize=128)
+def _cached_graphviz_layout(nodes: Tuple, edges: Tuple, prog: str) -> Dict:
+    """Run Graphviz once per distinct topology; `dot` is a subprocess per call."""
+    G = nx.DiGraph()
+    G.add_nodes_from(nodes)
+    G.add_edges_from(edges)
+    return nx.nx_agraph.graphviz_layout(G, prog=prog)
+
+
+def _graphviz_layout(G: nx.DiGraph, prog: str = 'dot') -> Dict:
+    """Graphviz layout for `G`, reused for graphs with the same nodes and edges."""
+    nodes = tuple(sorted(G.nodes(), key=str))
+    edges = tuple(sorted(G.edges(), key=str))
+    return dict(_cached_graphviz_layout(nodes, edges, prog))
+
+
+def _igraph_layout(G: nx.DiGraph) -> Dict:
+    """Fruchterman-Reingold layout computed by igraph's C core."""
+    index = {node: i for i, node in enumerate(G.nodes())}
+    graph = ig.Graph(n=len(index), edges=[(index[u], index[v]) for u, v in G.edges()], directed=True)
+    coords = graph.layout_fruchterman_reingold(niter=500).coords
+    return {node: tuple(coords[i]) for node, i in index.items()}
+
+
+def _sfdp_layout(G: nx.DiGraph) -> Optional[Dict]:
+    """graph-tool SFDP layout for large graphs, or None when not applicable."""
+    if gt is None or len(G) <= SFDP_LAYOUT_SIZE:
+        return None
+    nodes = list(G.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    graph = gt.Graph(directed=True)
+    graph.add_vertex(len(nodes))
+    graph.add_edge_list(np.array([(index[u], index[v]) for u, v in G.edges()], dtype=np.int64).reshape(-1, 2))
+    coords = gt.sfdp_layout(graph, multilevel=True).get_2d_array([0, 1]).T
+    return {node: tuple(coords[i]) for i, node in enumerate(nodes)}
+
+
+def _force_layout(G: nx.DiGraph, k: float, iterations: int) -> Dict:
+    """Force-directed fallback layout; large graphs use SFDP, Barnes-Hut or fewer spring iterations."""
+    pos = _sfdp_layout(G)
+    if pos is not None:
+        return pos
+    if len(G) <= FORCE_LAYOUT_APPROX_SIZE:
+        return nx.spring_layout(G, k=k, iterations=iterations, seed=42)
+    if ForceAtlas2 is not None:
+        forceatlas2 = ForceAtlas2(barnesHutOptimize=True, barnesHutTheta=1.2, verbose=False)
+        return forceatlas2.forceatlas2_networkx_layout(G.to_undirected(), iterations=100)
+    # networkx's spring layout is O(n^2) per iteration, so spend fewer of them
+    return nx.spring_layout(G, k=k, iterations=min(iterations, 50), seed=42)
+
+
+def _hierarchy_edges(root, children) -> List[Tuple]:
+    """Flatten a nested {parent: {child: ...} | [leaf, ...]} hierarchy into edges without recursion."""
+    edges = []
+    stack = [(root, children)]
+    while stack:
+        parent, children = stack.pop()
+        if isinstance(children, dict):
+            edges.extend((parent, child) for child in children)
+            stack.extend(reversed(children.items()))
+        elif isinstance(children, list):
+            edges.extend((parent, child) for child in children)
+    return edges
+
+
+def _hierarchical_layout(G: nx.DiGraph, root) -> Dict:
+    """Tiered tree layout in O(n + e): one row per BFS level under `root`.
+
+    Each node gets a slice of its parent's width proportional to the number of leaves
+    below it and sits in the middle of that slice, so subtrees never overlap.
+    """
+    children = dict(nx.bfs_successors(G, root))
+    order = [root] + [child for kids in children.values() for child in kids]
+    leaves = {}
+    for node in reversed(order):
+        leaves[node] = sum(leaves[child] for child in children.get(node, ())) or 1
+
+    pos = {}
+    stack = [(root, 0.0, 1.0, 0)]
+    while stack:
+        node, left, width, depth = stack.pop()
+        pos[node] = (left + width / 2, -depth)
+        for child in children.get(node, ()):
+            child_width = width * leaves[child] / leaves[node]
+            stack.append((child, left, child_width, depth + 1))
+            left += child_width
+    return pos
+
+
+def _layered_layout(G: nx.DiGraph) -> Optional[Dict]:
+    """Left-to-right layered DAG layout in O(n + e), one column per topological generation.
+
+    Within a column nodes are ordered by the mean position of their predecessors, a
+    single barycenter sweep that keeps most edges from crossing. Returns None when a
+    column or the number of columns would be too crowded to read.
+    """
+    generations = list(nx.topological_generations(G))
+    if len(generations) > MAX_FLOWCHART_LAYERS or max(map(len, generations)) > MAX_FLOWCHART_LAYERS:
+        return None
+    pos = {}
+    for depth, generation in enumerate(generations):
+        barycenters = {
+            node: np.mean([pos[pred][1] for pred in G.predecessors(node)]) if depth else 0.0
+            for node in generation
+        }
+        column = sorted(generation, key=barycenters.__getitem__, reverse=True)
+        for rank, node in enumerate(column):
+            pos[node] = (depth, 1 - (rank + 0.5) / len(column))
+    return pos
+
+
+def _shortest_path_distances(G: nx.Graph) -> Dict:
+    """All-pairs weighted distances for Kamada-Kawai, computed in C by SciPy."""
+    nodes = list(G.nodes())
+    adjacency = nx.to_scipy_sparse_array(G, nodelist=nodes, weight='weight')
+    dist = shortest_path(adjacency, method='D', directed=False)
+    # Unreachable pairs are left out so networkx applies its own disconnected default
+    return {
+        u: {v: dist[i, j] for j, v in enumerate(nodes) if np.isfinite(dist[i, j])}
+        for i, u in enumerate(nodes)
+    }
 
 
 class PythonDiagramGenerator:
     """Python-based diagram generator using matplotlib, networkx, and PIL."""
 
-    def __init__(self):
-        """Initialize the diagram generator."""
+    # Flowchart node areas for component types that differ from the 4000 default
+    _NODE_SIZES = {'database': 4500, 'gateway': 4200, 'external': 3800, 'cache': 3500}
+
+    # Global matplotlib setup is deferred to the first generator rather than done at import
+    _styled = False
+
+    @classmethod
+    def _apply_style(cls) -> None:
+        """Select the headless Agg backend and the diagram style, once per process."""
+        if cls._styled:
+            return
+        matplotlib.use('Agg', force=True)
+        plt.style.use('seaborn-v0_8')
+        sns.set_palette("husl")
+        cls._styled = True
+
+    def __init__(self, hi_res: bool = False, target_resolution: Optional[str] = None):
+        """Initialize the diagram generator.
+
+        Args:
+            hi_res: Render at 1920x1080 instead of the default 1280x720
+            target_resolution: Canvas size as "WIDTHxHEIGHT" pixels; overrides hi_res
+        """
+        self._apply_style()
+        
         # Enhanced color scheme for meeting visualizations
         self.colors = {
             # Technical component colors
@@ -50,12 +293,206 @@ class PythonDiagramGenerator:
             'edge': '#666666'
         }
         
+        # Flowchart styling tables indexed by node type; the last row is the 'service' default
+        self._node_type_index = {node_type: i for i, node_type in enumerate(self.colors)}
+        self._node_color_lut = np.array(list(self.colors.values()) + [self.colors['service']])
+        self._node_size_lut = np.array(
+            [self._NODE_SIZES.get(node_type, 4000) for node_type in self.colors] + [4000]
+        )
+        
         # Figure settings
-        self.figure_size = (19.2, 10.8)  # 1920x1080 at 100 DPI
+        # Telegram downscales photos to 1280px anyway, so 1280x720 is the default
+        if target_resolution is None:
+            target_resolution = '1920x1080' if hi_res else '1280x720'
+        width, height = (int(part) for part in target_resolution.lower().split('x'))
+        hi_res = width >= 1920
         self.dpi = 100
+        self.figure_size = (width / self.dpi, height / self.dpi)
+        # Tiny diagrams get a smaller canvas and graphs with many nodes a larger one; both follow
+        # the target resolution (960x540 and 1920x1080 at the 1280x720 default)
+        self.small_figure_size = (round(width * 0.75) / self.dpi, round(height * 0.75) / self.dpi)
+        self.large_figure_size = (round(width * 1.5) / self.dpi, round(height * 1.5) / self.dpi)
+        # Sparse diagrams have little fine detail, so they rasterize at a lower DPI
+        self.low_dpi = self.dpi if hi_res else 75
+        # Node areas are tuned for 1920x1080; shrink them with the canvas
+        self.node_scale = 1.0 if hi_res else 0.6
+        
+        # One Agg figure is reused by every diagram instead of allocating a new canvas each call.
+        # It is created on first use. Rendering runs on a worker thread; the lock keeps one
+        # render on the figure at a time.
+        self._fig: Optional[Figure] = None
+        self._figure_lock = asyncio.Lock()
+        # A dedicated worker keeps rendering off the default pool used by other to_thread calls
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="diagram-render")
+        
+        # Probe Graphviz once instead of failing an import on every layout
+        try:
+            import pygraphviz  # noqa: F401
+            self._has_graphviz = True
+        except ImportError:
+            self._has_graphviz = False
+
+    def close(self) -> None:
+        """Release the pooled figure and stop the render worker."""
+        self._executor.shutdown(wait=False)
+        if self._fig is not None:
+            self._fig.clear()
+            self._fig = None
+
+    async def _run_render(self, render, *args) -> str | bytes | None:
+        """Run a blocking `_render_*` method on the render worker without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(render, *args))
+
+    def _figure_size_for(self, count: int) -> Tuple[float, float]:
+        """Pick the figure size for a diagram with `count` nodes/events."""
+        if count <= TINY_GRAPH_SIZE:
+            return self.small_figure_size
+        if count >= LARGE_GRAPH_SIZE:
+            return self.large_figure_size
+        return self.figure_size
+
+    def _dpi_for(self, count: int) -> int:
+        """Pick the raster DPI for a diagram with `count` nodes/events."""
+        return self.dpi if count > DENSE_GRAPH_SIZE else self.low_dpi
+
+    def _new_figure(self, count: int, margins: Optional[Dict[str, float]] = None):
+        """Reset the pooled Agg figure for `count` nodes/events and return it with a fresh axes.
+
+        `margins` overrides DIAGRAM_MARGINS (in inches) for diagrams that need room for
+        tick labels or an outside legend. Callers must hold `_figure_lock`; the figure is
+        shared across diagrams.
+        """
+        if self._fig is None:
+            self._fig = Figure(figsize=self.figure_size, dpi=self.dpi)
+            FigureCanvasAgg(self._fig)
+        fig = self._fig
+        fig.clear()
+        width, height = self._figure_size_for(count)
+        fig.set_size_inches(width, height)
+        fig.set_dpi(self._dpi_for(count))
+        
+        # Fixed margins instead of tight_layout, which costs an extra full draw per diagram
+        inches = {**DIAGRAM_MARGINS, **(margins or {})}
+        fig.subplots_adjust(
+            left=inches['left'] / width,
+            right=1 - inches['right'] / width,
+            bottom=inches['bottom'] / height,
+            top=1 - inches['top'] / height,
+        )
+        ax = fig.add_subplot(111)
+        return fig, ax
 
-    async def create_flowchart(self, nodes: List[Dict], edges: List[Tuple], title: str = "System Architecture") -> Optional[str]:
-        """Create a flowchart diagram optimized for system architecture visualization."""
+    def _dot_layout(self, G: nx.DiGraph) -> Optional[Dict]:
+        """Hierarchical Graphviz `dot` layout, or None when Graphviz is unavailable."""
+        if not self._has_graphviz:
+            return None
+        try:
+            return _graphviz_layout(G, prog='dot')
+        except (FileNotFoundError, ValueError) as e:
+            # pygraphviz is installed but the `dot` executable is missing or failed
+            logger.warning(f"Graphviz layout failed, falling back: {e}")
+            self._has_graphviz = False
+            return None
+
+    def _save_figure(self, fig, kind: str, return_bytes: bool = False) -> str | bytes:
+        """Render the figure to PNG and return its path, or the PNG bytes if `return_bytes`."""
+        # Margins are fixed in _new_figure, so a single draw of the canvas is all that's
+        # needed; Pillow then encodes the Agg buffer directly, skipping savefig's bbox and
+        # metadata handling. Diagrams are uploaded once and discarded, so favour speed.
+        fig.patch.set_facecolor(self.colors['background'])
+        fig.canvas.draw()
+        width, height = fig.canvas.get_width_height()
+        image = Image.frombuffer('RGBA', (width, height), fig.canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1).convert('RGB')
+        
+        # The output file is only created once there is an image to write; the OS picks a
+        # unique name, so concurrent renders never overwrite each other
+        if return_bytes:
+            target = io.BytesIO()
+        else:
+            target = tempfile.NamedTemporaryFile(prefix='python_diagram_', suffix='.png', delete=False)
+        try:
+            with target:
+                image.save(target, 'PNG', compress_level=1, optimize=False)
+                png_bytes = target.getvalue() if return_bytes else None
+        except Exception:
+            if not return_bytes:
+                os.unlink(target.name)
+            raise
+        fig.clear()
+        
+        if return_bytes:
+            logger.info(f"Successfully created {kind}: {len(png_bytes)} bytes in memory")
+            return png_bytes
+        
+        logger.info(f"Successfully created {kind}: {target.name}")
+        return target.name
+
+    @staticmethod
+    def _draw_edges(G: nx.DiGraph, pos: Dict, ax, width, color: str, alpha: float = 0.7) -> None:
+        """Draw edges as one LineCollection plus one quiver collection of arrowheads."""
+        edges = list(G.edges())
+        nx.draw_networkx_edges(
+            G, pos,
+            edgelist=edges,
+            width=width,
+            edge_color=color,
+            alpha=alpha,
+            arrows=False,
+            ax=ax
+        )
+        
+        if not edges or len(edges) > MAX_ARROWHEAD_EDGES:
+            return
+        
+        starts = np.array([pos[u] for u, _ in edges], dtype=float)
+        ends = np.array([pos[v] for _, v in edges], dtype=float)
+        vectors = ends - starts
+        lengths = np.hypot(vectors[:, 0], vectors[:, 1])
+        keep = lengths > 0  # self-loops have no direction
+        if not keep.any():
+            return
+        
+        # Past the midpoint, where edge labels would otherwise hide the arrowhead
+        anchors = starts[keep] + 0.6 * vectors[keep]
+        directions = vectors[keep] / lengths[keep, None]
+        ax.quiver(
+            anchors[:, 0], anchors[:, 1], directions[:, 0], directions[:, 1],
+            angles='xy', pivot='mid', scale_units='inches', scale=8,
+            width=0.002, headwidth=7, headlength=7, headaxislength=6,
+            color=color, alpha=alpha, zorder=2
+        )
+
+    @staticmethod
+    def _cap_graph(G: nx.DiGraph, kind: str, priority: Optional[List] = None) -> nx.DiGraph:
+        """Prune `G` to at most MAX_NODES nodes, keeping `priority` order or the highest-degree nodes."""
+        if G.number_of_nodes() <= MAX_NODES:
+            return G
+        
+        if priority is None:
+            priority = sorted(G.nodes(), key=G.degree, reverse=True)
+        logger.warning(f"{kind} has {G.number_of_nodes()} nodes, keeping the first {MAX_NODES}")
+        return G.subgraph(priority[:MAX_NODES]).copy()
+
+    @staticmethod
+    def _tiny_layout(nodes: List) -> Dict:
+        """Precomputed positions for 1-3 nodes: a point, a line or a triangle."""
+        if len(nodes) == 3:
+            coords = [(0.5, 0.87), (0.0, 0.0), (1.0, 0.0)]
+        else:
+            coords = [(float(i), 0.0) for i in range(len(nodes))]
+        return dict(zip(nodes, coords, strict=True))
+
+    async def create_flowchart(self, nodes: List[Dict], edges: List[Tuple], title: str = "System Architecture", return_bytes: bool = False) -> str | bytes | None:
+        """Create a flowchart diagram optimized for system architecture visualization.
+
+        Graphs above MAX_NODES nodes are pruned to their highest-degree nodes.
+        """
+        async with self._figure_lock:
+            return await self._run_render(self._render_flowchart, nodes, edges, title, return_bytes)
+
+    def _render_flowchart(self, nodes: List[Dict], edges: List[Tuple], title: str = "System Architecture", return_bytes: bool = False) -> str | bytes | None:
+        """Blocking body of `create_flowchart`; runs with `_figure_lock` held."""
         try:
             # Create directed graph
             G = nx.DiGraph()
@@ -69,44 +506,43 @@ class PythonDiagramGenerator:
             # Add edges
             for edge in edges:
                 G.add_edge(edge[0], edge[1], label=edge[2] if len(edge) > 2 else "")
+            G = self._cap_graph(G, "Flowchart")
             
             # Create figure
-            fig, ax = plt.subplots(figsize=self.figure_size, dpi=self.dpi)
+            fig, ax = self._new_figure(len(G), LEGEND_MARGINS)
             fig.patch.set_facecolor(self.colors['background'])
             ax.set_facecolor(self.colors['background'])
             
             # Use hierarchical layout for better system architecture visualization
-            try:
-                # Try hierarchical layout first
-                pos = nx.nx_agraph.graphviz_layout(G, prog='dot')
-            except:
-                # Fallback to spring layout with better spacing
-                pos = nx.spring_layout(G, k=5, iterations=150, seed=42)
+            if len(G) <= TINY_GRAPH_SIZE:
+                pos = self._tiny_layout(list(G.nodes()))
+            else:
+                # Large graphs go to SFDP first, then hierarchical dot, then spring
+                pos = _sfdp_layout(G) or self._dot_layout(G)
+                if pos is None and nx.is_directed_acyclic_graph(G):
+                    # Process flows are usually acyclic, so lay them out in topological layers
+                    pos = _layered_layout(G)
+                if pos is None:
+                    if len(G) < SMALL_FLOWCHART_SIZE:
+                        pos = nx.circular_layout(G)
+                    else:
+                        # Fallback to spring layout with better spacing
+                        pos = _force_layout(G, k=5, iterations=150)
+            
+            # Gather node types and wrapped labels in a single pass over the nodes
+            node_types = []
+            labels = {}
+            for node_id, data in G.nodes(data=True):
+                node_types.append(data.get('node_type', 'service'))
+                labels[node_id] = _wrap_label(data['label'])
             
             # Draw nodes with different colors and sizes based on type
-            node_colors = []
-            node_sizes = []
-            node_shapes = []
-            for node_id, data in G.nodes(data=True):
-                node_type = data.get('node_type', 'service')
-                
-                # Set colors based on technical component type
-                if node_type in self.colors:
-                    node_colors.append(self.colors[node_type])
-                else:
-                    node_colors.append(self.colors['service'])  # Default
-                
-                # Set sizes based on component type
-                if node_type == 'database':
-                    node_sizes.append(4500)
-                elif node_type == 'gateway':
-                    node_sizes.append(4200)
-                elif node_type == 'external':
-                    node_sizes.append(3800)
-                elif node_type == 'cache':
-                    node_sizes.append(3500)
-                else:
-                    node_sizes.append(4000)
+            type_index = np.fromiter(
+                (self._node_type_index.get(node_type, -1) for node_type in node_types),
+                dtype=np.intp, count=len(node_types)
+            )
+            node_colors = self._node_color_lut[type_index].tolist()
+            node_sizes = self._node_size_lut[type_index] * self.node_scale
             
             # Draw nodes
             nx.draw_networkx_nodes(
@@ -118,41 +554,9 @@ class PythonDiagramGenerator:
             )
             
             # Draw edges with improved styling
-            nx.draw_networkx_edges(
-                G, pos,
-                edge_color=self.colors['edge'],
-                arrows=True,
-                arrowsize=20,
-                arrowstyle='->',
-                width=2,
-                alpha=0.7,
-                ax=ax,
-                connectionstyle="arc3,rad=0.1"
-            )
-            
-            # Draw labels with better formatting
-            labels = {}
-            for node_id, data in G.nodes(data=True):
-                label = data['label']
-                # Break long labels into multiple lines
-                if len(label) > 20:
-                    words = label.split()
-                    lines = []
-                    current_line = []
-                    for word in words:
-                        if len(' '.join(current_line + [word])) <= 20:
-                            current_line.append(word)
-                        else:
-                            if current_line:
-                                lines.append(' '.join(current_line))
-                                current_line = [word]
-                            else:
-                                lines.append(word)
-                    if current_line:
-                        lines.append(' '.join(current_line))
-                    label = '\n'.join(lines)
-                labels[node_id] = label
+            self._draw_edges(G, pos, ax, width=2, color=self.colors['edge'])
             
+            # Draw labels with better formatting, breaking long labels into multiple lines
             nx.draw_networkx_labels(
                 G, pos, labels,
                 font_size=10,
@@ -164,7 +568,7 @@ class PythonDiagramGenerator:
             
             # Draw edge labels
             edge_labels = nx.get_edge_attributes(G, 'label')
-            if edge_labels:
+            if edge_labels and len(edge_labels) <= MAX_EDGE_LABELS:
                 nx.draw_networkx_edge_labels(
                     G, pos, edge_labels,
                     font_size=9,
@@ -175,7 +579,7 @@ class PythonDiagramGenerator:
             
             # Add legend for node types
             legend_elements = []
-            unique_types = set(data.get('node_type', 'service') for _, data in G.nodes(data=True))
+            unique_types = set(node_types)
             
             # Define better labels for technical components
             type_labels = {
@@ -196,37 +600,30 @@ class PythonDiagramGenerator:
                                                 label=label))
             
             if legend_elements:
-                ax.legend(handles=legend_elements, loc='upper right', bbox_to_anchor=(1.15, 1),
+                ax.legend(handles=legend_elements, loc='upper left', bbox_to_anchor=(1.0, 1),
                          frameon=True, fancybox=True, shadow=True)
             
             # Set title
             ax.set_title(title, fontsize=18, fontweight='bold', color=self.colors['text'], pad=25)
             ax.axis('off')
             
-            # Save to file
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_path = f"/tmp/python_diagram_{timestamp}.png"
-            
-            plt.tight_layout()
-            plt.savefig(
-                output_path,
-                facecolor=self.colors['background'],
-                edgecolor='none',
-                bbox_inches='tight',
-                dpi=self.dpi,
-                format='png'
-            )
-            plt.close(fig)
-            
-            logger.info(f"Successfully created flowchart: {output_path}")
-            return output_path
+            # Save to file (or memory)
+            return self._save_figure(fig, "flowchart", return_bytes)
             
         except Exception as e:
             logger.error(f"Error creating flowchart: {e}", exc_info=True)
             return None
 
-    async def create_relationship_diagram(self, entities: List[str], relationships: List[Tuple], title: str = "System Dependencies") -> Optional[str]:
-        """Create a relationship/network diagram for technical dependencies and connections."""
+    async def create_relationship_diagram(self, entities: List[str], relationships: List[Tuple], title: str = "System Dependencies", return_bytes: bool = False) -> str | bytes | None:
+        """Create a relationship/network diagram for technical dependencies and connections.
+
+        Graphs above MAX_NODES entities are pruned to their highest-degree entities.
+        """
+        async with self._figure_lock:
+            return await self._run_render(self._render_relationship_diagram, entities, relationships, title, return_bytes)
+
+    def _render_relationship_diagram(self, entities: List[str], relationships: List[Tuple], title: str = "System Dependencies", return_bytes: bool = False) -> str | bytes | None:
+        """Blocking body of `create_relationship_diagram`; runs with `_figure_lock` held."""
         try:
             # Create directed graph for technical dependencies
             G = nx.DiGraph()
@@ -244,35 +641,41 @@ class PythonDiagramGenerator:
                     if rel_type:
                         edge_labels[(rel[0], rel[1])] = rel_type
             
+            if G.number_of_nodes() > MAX_NODES:
+                G = self._cap_graph(G, "Relationship diagram")
+                edge_labels = {edge: label for edge, label in edge_labels.items() if G.has_edge(*edge)}
+            
             # Create figure
-            fig, ax = plt.subplots(figsize=self.figure_size, dpi=self.dpi)
+            tiny = len(G) <= TINY_GRAPH_SIZE
+            fig, ax = self._new_figure(len(G))
             fig.patch.set_facecolor(self.colors['background'])
             ax.set_facecolor(self.colors['background'])
             
             # Generate layout
-            if len(G.nodes()) <= 10:
+            if tiny:
+                pos = self._tiny_layout(list(G.nodes()))
+            elif len(G.nodes()) <= 10:
                 pos = nx.spring_layout(G, k=3, iterations=100, seed=42)
+            elif gt is not None and len(G) > SFDP_LAYOUT_SIZE:
+                pos = _sfdp_layout(G)
+            elif ig is not None:
+                pos = _igraph_layout(G)
+            elif _SPRING_HAS_ENERGY_METHOD:
+                # L-BFGS minimisation of the Fruchterman-Reingold energy (networkx >= 3.5)
+                pos = nx.spring_layout(G, method='energy', iterations=50, seed=42)
             else:
-                pos = nx.kamada_kawai_layout(G)
+                pos = nx.kamada_kawai_layout(G, dist=_shortest_path_distances(G))
             
-            # Calculate node sizes based on degree centrality
-            centrality = nx.degree_centrality(G)
-            node_sizes = [2500 + centrality[node] * 3000 for node in G.nodes()]
+            # Calculate node sizes from degree relative to the best-connected node
+            if tiny:
+                node_sizes = 2500 * self.node_scale
+            else:
+                degrees = dict(G.degree())
+                max_degree = max(degrees.values(), default=1) or 1
+                node_sizes = [(2500 + 3000 * degrees[node] / max_degree) * self.node_scale for node in G.nodes()]
             
             # Color nodes based on technical entity type
-            node_colors = []
-            for entity in entities:
-                entity_lower = entity.lower()
-                if any(db in entity_lower for db in ['db', 'database', 'postgres', 'mysql', 'mongo']):
-                    node_colors.append(self.colors['database'])
-                elif any(svc in entity_lower for svc in ['service', 'api', 'endpoint']):
-                    node_colors.append(self.colors['service'])
-                elif any(cache in entity_lower for cache in ['cache', 'redis', 'memcached']):
-                    node_colors.append(self.colors['cache'])
-                elif any(queue in entity_lower for queue in ['queue', 'kafka', 'rabbitmq', 'sqs']):
-                    node_colors.append(self.colors['queue'])
-                else:
-                    node_colors.append(self.colors['primary'])
+            node_colors = [self.colors[_entity_type(entity)] for entity in G.nodes()]
             
             # Draw nodes
             nx.draw_networkx_nodes(
@@ -287,27 +690,11 @@ class PythonDiagramGenerator:
             edges = G.edges(data=True)
             widths = [edge[2].get('weight', 1) * 1.5 for edge in edges]
             
-            nx.draw_networkx_edges(
-                G, pos,
-                width=widths,
-                edge_color=self.colors['edge'],
-                alpha=0.7,
-                arrows=True,
-                arrowsize=15,
-                arrowstyle='->',
-                ax=ax,
-                connectionstyle="arc3,rad=0.1"
-            )
+            self._draw_edges(G, pos, ax, width=widths, color=self.colors['edge'])
+            
+            # Draw node labels, truncating long entity names
+            labels = {entity: _truncate_label(entity) for entity in G.nodes()}
             
-            # Draw node labels
-            labels = {}
-            for entity in entities:
-                # Truncate long entity names
-                if len(entity) > 15:
-                    labels[entity] = entity[:12] + "..."
-                else:
-                    labels[entity] = entity
-                    
             nx.draw_networkx_labels(
                 G, pos, labels,
                 font_size=9,
@@ -317,7 +704,7 @@ class PythonDiagramGenerator:
             )
             
             # Draw edge labels (relationship types)
-            if edge_labels:
+            if edge_labels and len(edge_labels) <= MAX_EDGE_LABELS:
                 nx.draw_networkx_edge_labels(
                     G, pos, edge_labels,
                     font_size=7,
@@ -330,85 +717,77 @@ class PythonDiagramGenerator:
             ax.set_title(title, fontsize=18, fontweight='bold', color=self.colors['text'], pad=25)
             ax.axis('off')
             
-            # Save to file
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_path = f"/tmp/python_diagram_{timestamp}.png"
-            
-            plt.tight_layout()
-            plt.savefig(
-                output_path,
-                facecolor=self.colors['background'],
-                edgecolor='none',
-                bbox_inches='tight',
-                dpi=self.dpi,
-                format='png'
-            )
-            plt.close(fig)
-            
-            logger.info(f"Successfully created relationship diagram: {output_path}")
-            return output_path
+            # Save to file (or memory)
+            return self._save_figure(fig, "relationship diagram", return_bytes)
             
         except Exception as e:
             logger.error(f"Error creating relationship diagram: {e}", exc_info=True)
             return None
 
-    async def create_timeline_diagram(self, events: List[Dict], title: str = "Timeline") -> Optional[str]:
+    async def create_timeline_diagram(self, events: List[Dict], title: str = "Timeline", return_bytes: bool = False) -> str | bytes | None:
         """Create a timeline diagram for meeting events and milestones."""
+        async with self._figure_lock:
+            return await self._run_render(self._render_timeline_diagram, events, title, return_bytes)
+
+    def _render_timeline_diagram(self, events: List[Dict], title: str = "Timeline", return_bytes: bool = False) -> str | bytes | None:
+        """Blocking body of `create_timeline_diagram`; runs with `_figure_lock` held."""
         try:
             # Create figure
-            fig, ax = plt.subplots(figsize=self.figure_size, dpi=self.dpi)
+            fig, ax = self._new_figure(len(events))
             fig.patch.set_facecolor(self.colors['background'])
             ax.set_facecolor(self.colors['background'])
             
             # Sort events by order if provided, otherwise use list order
-            sorted_events = sorted(events, key=lambda x: x.get('order', events.index(x)))
+            sorted_events = [
+                event for _, event in sorted(
+                    enumerate(events), key=lambda item: item[1].get('order', item[0])
+                )
+            ]
             
             # Create timeline
             y_pos = 0.5
-            x_positions = []
-            labels = []
-            colors = []
-            
-            for i, event in enumerate(sorted_events):
-                x_pos = i / (len(sorted_events) - 1) if len(sorted_events) > 1 else 0.5
-                x_positions.append(x_pos)
-                labels.append(event['label'])
-                
-                # Color based on event type
-                event_type = event.get('type', 'discussion')
-                colors.append(self.colors.get(event_type, self.colors['discussion']))
+            n = len(sorted_events)
+            x_positions = np.linspace(0.0, 1.0, n) if n != 1 else np.array([0.5])
+            labels = [event['label'] for event in sorted_events]
+            colors = [
+                self.colors.get(event.get('type', 'discussion'), self.colors['discussion'])
+                for event in sorted_events
+            ]
             
             # Draw timeline line
             ax.plot([0, 1], [y_pos, y_pos], color=self.colors['accent'], linewidth=6, alpha=0.8)
             
-            # Draw event points and labels
-            for i, (x_pos, label, color) in enumerate(zip(x_positions, labels, colors)):
-                # Draw point
-                ax.scatter(x_pos, y_pos, s=300, color=color, zorder=5, alpha=0.9, 
-                          edgecolors='white', linewidth=2)
-                
-                # Draw label with better positioning
-                y_offset = 0.15 if i % 2 == 0 else -0.15
-                
+            # Draw all event points as a single collection
+            ax.scatter(x_positions, np.full(len(x_positions), y_pos), s=300, c=colors, zorder=5,
+                      alpha=0.9, edgecolors='white', linewidths=2)
+            
+            # Labels alternate above and below the line; one collection of stems connects them
+            label_ys = np.where(np.arange(n) % 2 == 0, y_pos + 0.15, y_pos - 0.15)
+            stems = np.stack([
+                np.column_stack([x_positions, np.full(n, y_pos)]),
+                np.column_stack([x_positions, label_ys]),
+            ], axis=1)
+            ax.add_collection(LineCollection(stems, colors=self.colors['accent'], alpha=0.8,
+                                             linewidths=2, zorder=4))
+            
+            # Draw labels
+            for i, (x_pos, label_y, label, color) in enumerate(zip(x_positions, label_ys, labels, colors, strict=True)):
                 # Add timeframe information if available
                 event = sorted_events[i]
                 full_label = label
                 if event.get('timeframe'):
                     full_label = f"{label}\n({event['timeframe']})"
                 
-                ax.annotate(
+                ax.text(
+                    x_pos, label_y,
                     full_label,
-                    (x_pos, y_pos),
-                    xytext=(x_pos, y_pos + y_offset),
                     ha='center',
-                    va='bottom' if y_offset > 0 else 'top',
+                    va='bottom' if label_y > y_pos else 'top',
                     fontsize=10,
                     fontweight='bold',
                     color=self.colors['text'],
                     bbox=dict(boxstyle="round,pad=0.4", facecolor=color, alpha=0.8, 
-                             edgecolor='white', linewidth=1),
-                    arrowprops=dict(arrowstyle='->', color=self.colors['accent'], 
-                                  alpha=0.8, lw=2)
+                             edgecolor='white', linewidth=1)
                 )
             
             # Add legend for event types
@@ -431,91 +810,62 @@ class PythonDiagramGenerator:
             ax.set_ylim(-0.1, 1.1)
             ax.axis('off')
             
-            # Save to file
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_path = f"/tmp/python_diagram_{timestamp}.png"
-            
-            plt.tight_layout()
-            plt.savefig(
-                output_path,
-                facecolor=self.colors['background'],
-                edgecolor='none',
-                bbox_inches='tight',
-                dpi=self.dpi,
-                format='png'
-            )
-            plt.close(fig)
-            
-            logger.info(f"Successfully created timeline diagram: {output_path}")
-            return output_path
+            # Save to file (or memory)
+            return self._save_figure(fig, "timeline diagram", return_bytes)
             
         except Exception as e:
             logger.error(f"Error creating timeline diagram: {e}", exc_info=True)
             return None
 
-    async def create_hierarchy_diagram(self, hierarchy: Dict, title: str = "Hierarchy") -> Optional[str]:
-        """Create a hierarchical/organizational diagram."""
+    async def create_hierarchy_diagram(self, hierarchy: Dict, title: str = "Hierarchy", return_bytes: bool = False) -> str | bytes | None:
+        """Create a hierarchical/organizational diagram.
+
+        Hierarchies above MAX_NODES nodes keep the nodes closest to the root.
+        """
+        async with self._figure_lock:
+            return await self._run_render(self._render_hierarchy_diagram, hierarchy, title, return_bytes)
+
+    def _render_hierarchy_diagram(self, hierarchy: Dict, title: str = "Hierarchy", return_bytes: bool = False) -> str | bytes | None:
+        """Blocking body of `create_hierarchy_diagram`; runs with `_figure_lock` held."""
         try:
             # Create directed graph
             G = nx.DiGraph()
             
-            def add_hierarchy_to_graph(parent, children_dict, graph):
-                if isinstance(children_dict, dict):
-                    for child, grandchildren in children_dict.items():
-                        graph.add_edge(parent, child)
-                        add_hierarchy_to_graph(child, grandchildren, graph)
-                elif isinstance(children_dict, list):
-                    for child in children_dict:
-                        graph.add_edge(parent, child)
-            
             # Add root and build hierarchy
-            root = list(hierarchy.keys())[0]
+            root = next(iter(hierarchy))
             G.add_node(root)
-            add_hierarchy_to_graph(root, hierarchy[root], G)
+            G.add_edges_from(_hierarchy_edges(root, hierarchy[root]))
+            if G.number_of_nodes() > MAX_NODES:
+                G = self._cap_graph(G, "Hierarchy", [root] + [child for _, child in nx.bfs_edges(G, root)])
             
             # Create figure
-            fig, ax = plt.subplots(figsize=self.figure_size, dpi=self.dpi)
+            fig, ax = self._new_figure(len(G))
             fig.patch.set_facecolor(self.colors['background'])
             ax.set_facecolor(self.colors['background'])
             
-            # Use hierarchical layout
-            pos = nx.nx_agraph.graphviz_layout(G, prog='dot') if hasattr(nx, 'nx_agraph') else nx.spring_layout(G, k=3, iterations=50)
+            # Use Graphviz dot when available, otherwise lay the tree out level by level
+            pos = self._dot_layout(G) if len(G) > TINY_GRAPH_SIZE else None
+            if pos is None:
+                pos = _hierarchical_layout(G, root)
             
-            # Draw nodes with different colors based on hierarchy level
-            levels = {}
-            for node in G.nodes():
-                try:
-                    levels[node] = nx.shortest_path_length(G, root, node)
-                except:
-                    levels[node] = 0
+            # Levels come from a single BFS from the root
+            levels = nx.single_source_shortest_path_length(G, root)
             
-            max_level = max(levels.values()) if levels else 0
+            # Darker green for nodes closer to the root, drawn as a single collection
+            nodelist = list(G.nodes())
+            node_colors = [plt.cm.Greens(max(0.3, 1 - levels[node] * 0.2)) for node in nodelist]
             
-            for level in range(max_level + 1):
-                level_nodes = [node for node, node_level in levels.items() if node_level == level]
-                color_intensity = 1 - (level * 0.2)
-                color = plt.cm.Greens(max(0.3, color_intensity))
-                
-                nx.draw_networkx_nodes(
-                    G, pos, nodelist=level_nodes,
-                    node_color=[color],
-                    node_size=2500,
-                    alpha=0.9,
-                    ax=ax
-                )
-            
-            # Draw edges
-            nx.draw_networkx_edges(
-                G, pos,
-                edge_color=self.colors['accent'],
-                arrows=True,
-                arrowsize=15,
-                arrowstyle='->',
-                width=2,
-                alpha=0.7,
+            nx.draw_networkx_nodes(
+                G, pos, nodelist=nodelist,
+                node_color=node_colors,
+                node_size=2500 * self.node_scale,
+                alpha=0.9,
                 ax=ax
             )
             
+            # Draw edges
+            self._draw_edges(G, pos, ax, width=2, color=self.colors['accent'])
+            
             # Draw labels
             nx.draw_networkx_labels(
                 G, pos,
@@ -529,33 +879,23 @@ class PythonDiagramGenerator:
             ax.set_title(title, fontsize=16, fontweight='bold', color=self.colors['text'], pad=20)
             ax.axis('off')
             
-            # Save to file
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_path = f"/tmp/python_diagram_{timestamp}.png"
-            
-            plt.tight_layout()
-            plt.savefig(
-                output_path,
-                facecolor=self.colors['background'],
-                edgecolor='none',
-                bbox_inches='tight',
-                dpi=self.dpi,
-                format='png'
-            )
-            plt.close(fig)
-            
-            logger.info(f"Successfully created hierarchy diagram: {output_path}")
-            return output_path
+            # Save to file (or memory)
+            return self._save_figure(fig, "hierarchy diagram", return_bytes)
             
         except Exception as e:
             logger.error(f"Error creating hierarchy diagram: {e}", exc_info=True)
             return None
 
-    async def create_simple_chart(self, data: Dict, chart_type: str = "bar", title: str = "Chart") -> Optional[str]:
+    async def create_simple_chart(self, data: Dict, chart_type: str = "bar", title: str = "Chart", return_bytes: bool = False) -> str | bytes | None:
         """Create a simple chart (bar, pie, etc.) for meeting data."""
+        async with self._figure_lock:
+            return await self._run_render(self._render_simple_chart, data, chart_type, title, return_bytes)
+
+    def _render_simple_chart(self, data: Dict, chart_type: str = "bar", title: str = "Chart", return_bytes: bool = False) -> str | bytes | None:
+        """Blocking body of `create_simple_chart`; runs with `_figure_lock` held."""
         try:
             # Create figure
-            fig, ax = plt.subplots(figsize=self.figure_size, dpi=self.dpi)
+            fig, ax = self._new_figure(len(data), CHART_MARGINS)
             fig.patch.set_facecolor(self.colors['background'])
             ax.set_facecolor(self.colors['background'])
             
@@ -563,7 +903,7 @@ class PythonDiagramGenerator:
             values = list(data.values())
             
             if chart_type == "pie":
-                colors = sns.color_palette("husl", len(labels))
+                colors = _husl_palette(len(labels))
                 wedges, texts, autotexts = ax.pie(
                     values, labels=labels, autopct='%1.1f%%',
                     colors=colors, startangle=90
@@ -575,16 +915,16 @@ class PythonDiagramGenerator:
                     
             elif chart_type == "line":
                 # Line chart for time series data
-                colors = sns.color_palette("husl", 1)
+                colors = _husl_palette(1)
                 ax.plot(labels, values, marker='o', linewidth=3, markersize=8, 
                        color=colors[0], alpha=0.8)
                 ax.grid(True, alpha=0.3)
                 ax.set_xlabel('Categories', fontweight='bold', fontsize=12)
                 ax.set_ylabel('Values', fontweight='bold', fontsize=12)
-                plt.xticks(rotation=45, ha='right')
+                plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
                 
             else:  # bar chart
-                colors = sns.color_palette("husl", len(labels))
+                colors = _husl_palette(len(labels))
                 bars = ax.bar(labels, values, color=colors, alpha=0.8)
                 
                 # Add value labels on bars
@@ -597,28 +937,13 @@ class PythonDiagramGenerator:
                 ax.set_xlabel('Categories', fontweight='bold', fontsize=12)
                 ax.set_ylabel('Values', fontweight='bold', fontsize=12)
                 ax.grid(True, alpha=0.3, axis='y')
-                plt.xticks(rotation=45, ha='right')
+                plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
             
             # Set title
             ax.set_title(title, fontsize=18, fontweight='bold', color=self.colors['text'], pad=25)
             
-            # Save to file
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_path = f"/tmp/python_diagram_{timestamp}.png"
-            
-            plt.tight_layout()
-            plt.savefig(
-                output_path,
-                facecolor=self.colors['background'],
-                edgecolor='none',
-                bbox_inches='tight',
-                dpi=self.dpi,
-                format='png'
-            )
-            plt.close(fig)
-            
-            logger.info(f"Successfully created {chart_type} chart: {output_path}")
-            return output_path
+            # Save to file (or memory)
+            return self._save_figure(fig, f"{chart_type} chart", return_bytes)
             
         except Exception as e:
             logger.error(f"Error creating {chart_type} chart: {e}", exc_info=True)
@@ -1,13 +1,165 @@
 """Question answering service for transcript-based queries using Claude Sonnet 4."""
 
+import functools
+import math
 import os
-from typing import Optional
+import re
+import textwrap
+from collections import Counter
+from typing import List, Optional, Tuple
 
 from loguru import logger
 
 from telegram_bot.services.ai_model import create_ai_model
 
 
+@functools.lru_cache(maxsize=64)
+def _read_transcript_cached(file_path: str, mtime_ns: int, size: int) -> str:
+    """Read a transcript; the stat fields in the key invalidate stale entries."""
+    # Text mode translates CRLF line endings, so paragraph splitting sees plain blank lines
+    with open(file_path, 'r', encoding='utf-8') as file:
+        return file.read().strip()
+
+
+# Transcripts longer than this are cut down to the passages most relevant to the question
+TRANSCRIPT_TOKEN_BUDGET = 8000
+# Rough characters-per-token ratio used to estimate prompt size without a tokenizer
+CHARS_PER_TOKEN = 4
+
+# Paragraphs longer than this are ranked as separate windows of whole lines or sentences
+MAX_PASSAGE_CHARS = 2000
+
+# Okapi BM25 parameters
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_WORD_RE = re.compile(r'\w+')
+_SENTENCE_BREAK_RE = re.compile(r'(?<=[.!?])\s+')
+# Marks omitted text between selected passages
+_PASSAGE_SEPARATOR = '\n\n...\n\n'
+
+
+def _tokenize(text: str) -> List[str]:
+    """Lowercase word tokens for lexical matching."""
+    return _WORD_RE.findall(text.lower())
+
+
+def _split_passage(passage: str, max_chars: int) -> List[str]:
+    """Break a passage longer than `max_chars` into windows of whole lines, then sentences.
+
+    A single run-on sentence is finally cut at word boundaries, so every window fits.
+    """
+    if len(passage) <= max_chars:
+        return [passage]
+    if '\n' in passage:
+        pieces, separator = passage.split('\n'), '\n'
+    else:
+        pieces, separator = _SENTENCE_BREAK_RE.split(passage), ' '
+        if len(pieces) == 1:
+            return textwrap.wrap(passage, max_chars)
+
+    windows = []
+    current = ''
+    for piece in pieces:
+        piece = piece.strip()
+        if not piece:
+            continue
+        for part in _split_passage(piece, max_chars):
+            if current and len(current) + len(separator) + len(part) <= max_chars:
+                current += separator + part
+            else:
+                if current:
+                    windows.append(current)
+                current = part
+    if current:
+        windows.append(current)
+    return windows
+
+
+@functools.lru_cache(maxsize=8)
+def _passage_index(
+    transcript: str, max_chars: int
+) -> Tuple[Tuple[str, ...], Tuple[Counter, ...], Counter, float]:
+    """Split a transcript into passages of at most `max_chars` and index their terms, once."""
+    passages = tuple(
+        window
+        for paragraph in transcript.split('\n\n')
+        if paragraph.strip()
+        for window in _split_passage(paragraph.strip(), max_chars)
+    )
+    term_counts = tuple(Counter(_tokenize(passage)) for passage in passages)
+    doc_freqs = Counter(term for counts in term_counts for term in counts)
+    avg_length = sum(sum(counts.values()) for counts in term_counts) / max(len(passages), 1)
+    return passages, term_counts, doc_freqs, avg_length or 1.0
+
+
+def _select_passages(transcript: str, question: str, token_budget: int = TRANSCRIPT_TOKEN_BUDGET) -> str:
+    """Keep the paragraphs that best match the question (BM25) within the token budget.
+
+    Transcripts that already fit are returned unchanged; selected paragraphs keep their
+    original order so the model still reads the conversation as it happened. Paragraphs too
+    long to fit are ranked as smaller windows, so even a transcript without blank lines is
+    trimmed by relevance rather than cut off at the budget.
+    """
+    char_budget = token_budget * CHARS_PER_TOKEN
+    if len(transcript) <= char_budget:
+        return transcript
+
+    max_chars = max(min(MAX_PASSAGE_CHARS, char_budget - len(_PASSAGE_SEPARATOR)), 1)
+    passages, term_counts, doc_freqs, avg_length = _passage_index(transcript, max_chars)
+    query_terms = set(_tokenize(question))
+    count = len(passages)
+    idf = {
+        term: math.log((count - doc_freqs[term] + 0.5) / (doc_freqs[term] + 0.5) + 1)
+        for term in query_terms
+    }
+
+    scores = []
+    for counts in term_counts:
+        length_norm = BM25_K1 * (1 - BM25_B + BM25_B * sum(counts.values()) / avg_length)
+        scores.append(sum(
+            idf[term] * counts[term] * (BM25_K1 + 1) / (counts[term] + length_norm)
+            for term in query_terms if term in counts
+        ))
+
+    selected = []
+    used = 0
+    for i in sorted(range(count), key=lambda i: scores[i], reverse=True):
+        size = len(passages[i]) + len(_PASSAGE_SEPARATOR)
+        if used + size > char_budget:
+            continue
+        selected.append(i)
+        used += size
+
+    return _PASSAGE_SEPARATOR.join(passages[i] for i in sorted(selected))
+
+
+# Static parts of the question prompt, built once; only the transcript and question vary
+_PROMPT_PREFIX = """You are an AI assistant helping users understand and extract information from transcripts. You have been given a transcript and a question about it. Please analyze the transcript carefully and provide a helpful, accurate answer.
+
+**Transcript:**
+"""
+_PROMPT_MIDDLE = """
+
+**Question:** """
+_PROMPT_INSTRUCTIONS = """
+
+**Instructions:**
+- Read through the entire transcript carefully
+- Answer the question based only on information present in the transcript
+- If the answer isn't clear from the transcript, say so honestly
+- Provide specific quotes or references when relevant
+- Be concise but thorough in your response
+- If the question asks for specific information (like names, dates, action items), extract them precisely
+- If the question is about the overall content, provide a well-structured summary"""
+# Added to the instructions when _select_passages trimmed the transcript
+_EXCERPT_NOTE = """
+- The transcript above is an excerpt: only the passages most relevant to the question are included, and "..." marks omitted parts. If the question needs the whole conversation (for example an overall summary), say that your answer is based on excerpts"""
+_PROMPT_ANSWER = """
+
+**Answer:**"""
+
+
 class QuestionAnsweringService:
     """Service for answering questions about transcripts using Claude Sonnet 4."""
 
@@ -30,24 +182,15 @@ class QuestionAnsweringService:
             Answer to the question or None if failed
         """
         try:
+            # Long transcripts are cut down to the most relevant passages to bound prompt size
+            excerpt = _select_passages(transcript_content, question)
+            trimmed = excerpt != transcript_content
+            
             # Create a detailed prompt for Claude to analyze the transcript and answer the question
-            prompt = f"""You are an AI assistant helping users understand and extract information from transcripts. You have been given a transcript and a question about it. Please analyze the transcript carefully and provide a helpful, accurate answer.
-
-**Transcript:**
-{transcript_content}
-
-**Question:** {question}
-
-**Instructions:**
-- Read through the entire transcript carefully
-- Answer the question based only on information present in the transcript
-- If the answer isn't clear from the transcript, say so honestly
-- Provide specific quotes or references when relevant
-- Be concise but thorough in your response
-- If the question asks for specific information (like names, dates, action items), extract them precisely
-- If the question is about the overall content, provide a well-structured summary
-
-**Answer:**"""
+            prompt = "".join((
+                _PROMPT_PREFIX, excerpt, _PROMPT_MIDDLE, question,
+                _PROMPT_INSTRUCTIONS, _EXCERPT_NOTE if trimmed else "", _PROMPT_ANSWER,
+            ))
 
             logger.info(f"Generating answer for question: {question[:100]}...")
             
@@ -75,12 +218,14 @@ class QuestionAnsweringService:
             Transcript content or None if failed
         """
         try:
-            if not os.path.exists(file_path):
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
                 logger.error(f"Transcript file not found: {file_path}")
                 return None
                 
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read().strip()
+            # Follow-up questions re-read the same file, so reads are cached by path and stat
+            content = _read_transcript_cached(file_path, stat.st_mtime_ns, stat.st_size)
                 
             if not content:
                 logger.error(f"Transcript file is empty: {file_path}")
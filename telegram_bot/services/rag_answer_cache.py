@@ -0,0 +1,125 @@
+"""Semantic cache of RAG answers, keyed by intent and question embedding."""
+
+import hashlib
+import time
+from typing import Any
+
+import orjson
+from chromadb import Collection
+from chromadb.api import ClientAPI
+from loguru import logger
+
+# Largest cosine distance between two questions that may share an answer; questions with the
+# same intent key this close are rephrasings rather than different questions
+ANSWER_CACHE_MAX_DISTANCE = 0.08
+
+
+def answer_cache_key(intent: str, where: dict[str, Any] | None) -> str:
+    """Key for answers that may be reused across questions with this intent and metadata filter.
+
+    The filter holds the normalized projects and dates retrieval is restricted to, so a similar
+    question about another project or period never shares an answer.
+    """
+    key = orjson.dumps({"intent": intent, "where": where}, option=orjson.OPT_SORT_KEYS)
+    return hashlib.blake2b(key, digest_size=16).hexdigest()
+
+
+class SemanticAnswerCache:
+    """Reuse answers to near-identical questions, stored in a per-user Chroma collection."""
+
+    def __init__(
+        self,
+        client: ClientAPI,
+        ttl_seconds: int,
+        max_distance: float = ANSWER_CACHE_MAX_DISTANCE,
+    ) -> None:
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.max_distance = max_distance
+
+    @property
+    def enabled(self) -> bool:
+        """Whether answers are cached at all; a TTL of 0 turns the cache off."""
+        return self.ttl_seconds > 0
+
+    def _collection_name(self, user_id: int) -> str:
+        """Get answer cache collection name for user."""
+        return f"user_{user_id}_answer_cache"
+
+    def _collection(self, user_id: int) -> Collection:
+        """Open the user's answer cache; distances are cosine so the threshold is scale-free."""
+        # Callers always pass embeddings, so the collection needs no embedding function
+        return self.client.get_or_create_collection(
+            name=self._collection_name(user_id),
+            metadata={"user_id": str(user_id), "hnsw:space": "cosine"},
+            embedding_function=None,
+        )
+
+    def lookup(
+        self, user_id: int, intent_key: str, embedding: list[float]
+    ) -> str | None:
+        """Return a fresh cached answer to a question close to `embedding`, if any."""
+        if not self.enabled:
+            return None
+        try:
+            results = self._collection(user_id).query(
+                query_embeddings=[embedding],
+                n_results=1,
+                where={
+                    "$and": [
+                        {"intent_key": intent_key},
+                        {"created_at": {"$gte": int(time.time()) - self.ttl_seconds}},
+                    ]
+                },
+                include=["metadatas", "distances"],
+            )
+        except Exception as exc:
+            logger.warning("Answer cache lookup failed for user {}: {}", user_id, exc)
+            return None
+
+        metadatas: list[dict[str, Any]] = (results.get("metadatas") or [[]])[0]
+        distances: list[float] = (results.get("distances") or [[]])[0]
+        if not metadatas or distances[0] > self.max_distance:
+            return None
+        logger.info(
+            "Answer cache hit for user {} (distance {:.3f})", user_id, distances[0]
+        )
+        return metadatas[0].get("answer") or None
+
+    def store(
+        self,
+        user_id: int,
+        intent_key: str,
+        question: str,
+        embedding: list[float],
+        answer: str,
+    ) -> None:
+        """Cache an answer and drop entries that have outlived the TTL."""
+        if not self.enabled:
+            return
+        now = int(time.time())
+        try:
+            collection = self._collection(user_id)
+            collection.upsert(
+                ids=[
+                    hashlib.blake2b(
+                        f"{intent_key}|{question}".encode("utf-8"), digest_size=16
+                    ).hexdigest()
+                ],
+                embeddings=[embedding],
+                documents=[question],
+                metadatas=[
+                    {"intent_key": intent_key, "answer": answer, "created_at": now}
+                ],
+            )
+            collection.delete(where={"created_at": {"$lt": now - self.ttl_seconds}})
+        except Exception as exc:
+            logger.warning("Failed to cache answer for user {}: {}", user_id, exc)
+
+    def clear(self, user_id: int) -> None:
+        """Drop every cached answer for the user, e.g. after new meetings are indexed."""
+        try:
+            self.client.delete_collection(self._collection_name(user_id))
+        except Exception:
+            # Nothing cached yet for this user
+            pass
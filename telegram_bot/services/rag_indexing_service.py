@@ -1,23 +1,210 @@
 """Service handling meeting ingestion and vector indexing for RAG."""
 
+import asyncio
+import bisect
+import functools
 import hashlib
+import itertools
 import json
+import math
 import re
 import textwrap
-from dataclasses import dataclass
+from collections.abc import Awaitable, Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, replace
 from typing import Any
 
-from chromadb import PersistentClient
+import orjson
+from chromadb import Collection
 from chromadb.api import ClientAPI
 from loguru import logger
 
 from telegram_bot.config import get_settings
 from telegram_bot.services.ai_model import AIModel, create_ai_model
-from telegram_bot.services.gemini_embedding import GeminiEmbeddingFunction
+from telegram_bot.services.chroma_client import create_chroma_client
+from telegram_bot.services.gemini_embedding import (
+    GeminiEmbeddingFunction,
+    get_embedding_function,
+)
+from telegram_bot.services.rag_answer_cache import SemanticAnswerCache
 from telegram_bot.services.rag_storage_service import RAGStorageService
 
-
-@dataclass
+try:
+    import ahocorasick
+except ImportError:  # optional: single-pass multi-anchor search (pyahocorasick)
+    ahocorasick = None
+
+# Upper bound on concurrent episode-summary LLM calls during one ingest
+MAX_CONCURRENT_SUMMARIES = 8
+
+# Transcripts longer than this many words are segmented in windows of about this size
+SEGMENTATION_WINDOW_WORDS = 4000
+
+# Words each window repeats from the end of the previous one, so an episode cut by a window
+# boundary is seen with context on both sides; capped at a quarter of the window size
+SEGMENTATION_WINDOW_OVERLAP_WORDS = 400
+
+# Upper bound on concurrent segmentation LLM calls for one long transcript
+MAX_CONCURRENT_SEGMENTATIONS = 4
+
+# Chunks per collection.upsert call when indexing
+UPSERT_BATCH_SIZE = 1000
+
+# Projects per chunk that also get a filterable `project_<alias>_score` metadata field
+MAX_PROJECT_SCORE_FIELDS = 3
+
+# Sentence-ending punctuation followed by whitespace; episodes are cut at these points
+_SENTENCE_END_RE = re.compile(r"[.!?]\s+")
+
+# Whitespace after sentence-ending punctuation; chunks are assembled from the pieces
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
+# Runs of characters that project aliases collapse to a single underscore
+_ALIAS_SEPARATOR_RE = re.compile(r"[^a-z0-9]+")
+
+# Markdown code fence (```json ... ```) wrapped around an LLM JSON response
+_FENCE_RE = re.compile(r"\A```[^\n]*\n?|\n?```\s*\Z")
+
+# Static segmentation instructions, sent as the system prompt so providers can cache them
+_SEGMENTATION_SYSTEM_PROMPT = textwrap.dedent(
+    """
+    You are an expert meeting analyst. Analyze the following meeting transcript and split it into coherent episodes.
+
+    IMPORTANT GUIDELINES:
+    1. Target episode length: 300-600 words (2-4 minutes of discussion)
+    2. Each episode should focus on ONE specific topic, project discussion, or decision point
+    3. When projects are mentioned, track them throughout the related discussion
+    4. Include action items, decisions, and requirements as part of the relevant episode
+    5. For multi-hour meetings, create 5-15 episodes depending on content
+
+    EPISODE STRUCTURE:
+    - order: Sequential number (1, 2, 3...)
+    - title: Short descriptive title (5-8 words)
+    - summary: 2-3 sentences capturing key points, decisions, and action items
+    - topics: List of keywords (e.g., ["deployment", "database", "API design"])
+    - projects: Array of {"alias": "ProjectName", "confidence": 0.0-1.0, "quote": "supporting quote from transcript"}
+    - start_anchor: Copy the FIRST 10-20 words of the episode verbatim
+    - end_anchor: Copy the LAST 10-20 words of the episode verbatim
+    - confidence: Your confidence this segmentation is correct (0.0-1.0)
+    - notes: Optional clarifications
+
+    EXAMPLES OF GOOD EPISODES:
+
+    Example 1 - Project Discussion:
+    {
+      "order": 1,
+      "title": "PiggyBank Project Requirements Review",
+      "summary": "Team reviewed requirements for PiggyBank savings feature. Decided to implement automatic round-up transfers. Action item: Sarah to create API spec by Friday.",
+      "topics": ["requirements", "savings", "API", "round-up transfers"],
+      "projects": [{"alias": "PiggyBank", "confidence": 0.95, "quote": "So for PiggyBank, we need to figure out the automatic savings logic"}],
+      "start_anchor": "Alright, let's talk about the PiggyBank feature requirements.",
+      "end_anchor": "Great, so Sarah will have that spec ready by end of week.",
+      "confidence": 0.9
+    }
+
+    Example 2 - Action Items:
+    {
+      "order": 2,
+      "title": "Deployment Timeline and Owner Assignment",
+      "summary": "Discussed deployment schedule for Q1. John will handle staging deployment on Monday. Production rollout scheduled for next Thursday with Alex as owner.",
+      "topics": ["deployment", "timeline", "assignments", "Q1 planning"],
+      "projects": [{"alias": "Platform Migration", "confidence": 0.7, "quote": "the migration work needs to be deployed carefully"}],
+      "start_anchor": "Let's nail down the deployment timeline for next week.",
+      "end_anchor": "Perfect, so Alex owns the production deployment next Thursday.",
+      "confidence": 0.85
+    }
+
+    Respond ONLY with valid JSON in this exact format:
+    {"episodes": [ ... ]}
+    """
+).strip()
+
+# Prefix of summary cache keys; bump it when the summary prompt changes so stale entries miss
+_SUMMARY_CACHE_VERSION = "summary:v1:"
+
+_SUMMARY_SYSTEM_PROMPT = (
+    "Summarize this meeting episode in 2-3 sentences.\n"
+    "Focus on: key decisions, action items, requirements discussed, and owners/deadlines if mentioned."
+)
+
+# Per-request user prompts; only these placeholders change between calls
+_SEGMENTATION_PROMPT_TEMPLATE = (
+    "TRANSCRIPT INFO:\n"
+    "- Total words: {word_count}\n"
+    "- Expected episodes: {expected}\n\n"
+    "TRANSCRIPT:\n{transcript}"
+)
+_SUMMARY_PROMPT_TEMPLATE = "Episode:\n{excerpt}"
+
+
+def _fingerprint(text: str) -> str:
+    """Cache key for transcript and episode text; not used for anything security-related."""
+    return hashlib.sha256(text.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+def _count_words(text: str) -> int:
+    """Whitespace-delimited word count without materializing every word of a long transcript at once."""
+    return sum(map(len, map(str.split, text.splitlines())))
+
+
+def _finite_float(value: Any, default: float) -> float:
+    """Coerce an LLM-provided number, using `default` for nulls, non-numbers and NaN/Infinity."""
+    try:
+        number = float(value if value is not None else default)
+    except (TypeError, ValueError):
+        return default
+    return number if math.isfinite(number) else default
+
+
+def _loads_json(text: str) -> Any:
+    """Parse JSON with orjson, falling back to the stdlib for LLM output it rejects (NaN, Infinity)."""
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return json.loads(text)
+
+
+def project_score_field(alias_norm: str) -> str:
+    """Metadata key holding a chunk's affinity score for a normalized project alias."""
+    return f"project_{alias_norm}_score"
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_alias(alias: str) -> str:
+    """Normalize project alias for consistent matching; indexing and query filters must agree."""
+    return _ALIAS_SEPARATOR_RE.sub("_", alias.lower()).strip("_")
+
+
+class _AnchorIndex:
+    """Case-insensitive literal anchor lookup over one lowercased transcript.
+
+    With pyahocorasick installed every anchor is located in a single pass over the text
+    and later lookups are binary searches; otherwise lookups fall back to `str.find`.
+    """
+
+    def __init__(self, lowered: str, needles: Iterable[str] = ()) -> None:
+        self.lowered = lowered
+        self.hits: dict[str, list[int]] | None = None
+        needles = {needle for needle in needles if needle}
+        if ahocorasick is not None and needles:
+            automaton = ahocorasick.Automaton()
+            for needle in needles:
+                automaton.add_word(needle, needle)
+            automaton.make_automaton()
+            self.hits = {needle: [] for needle in needles}
+            for end_idx, needle in automaton.iter(lowered):
+                self.hits[needle].append(end_idx - len(needle) + 1)
+
+    def find(self, needle: str, pos: int) -> int:
+        """Return the first index of `needle` at or after `pos`, or -1."""
+        if self.hits is None or needle not in self.hits:
+            return self.lowered.find(needle, pos)
+        positions = self.hits[needle]
+        idx = bisect.bisect_left(positions, pos)
+        return positions[idx] if idx < len(positions) else -1
+
+
+@dataclass(slots=True, frozen=True)
 class EpisodeChunk:
     """Represents a chunk of meeting transcript prepared for indexing."""
 
@@ -33,7 +220,7 @@ class EpisodeChunk:
     metadata: dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EpisodePlanSegment:
     """Structured episode plan data returned by the LLM."""
 
@@ -48,7 +235,16 @@ class EpisodePlanSegment:
     notes: str | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
+class _SegmentationWindow:
+    """Character span of one segmentation window; text before `body_start` repeats the previous window."""
+
+    start: int
+    body_start: int
+    end: int
+
+
+@dataclass(slots=True)
 class Episode:
     """Episode segmentation result used for indexing."""
 
@@ -80,13 +276,29 @@ class RAGIndexingService:
         self.embedding_model_name = embedding_model or settings.rag_embedding_model
         self.chunk_size = settings.rag_chunk_size
         self.chunk_overlap = settings.rag_chunk_overlap
-        self.client: ClientAPI = client or PersistentClient(path=f"{self.base_path}/chroma")
+        self.client: ClientAPI = client or create_chroma_client(
+            path=f"{self.base_path}/chroma",
+            host=settings.chroma_host,
+            port=settings.chroma_port,
+        )
         self.ai_model = ai_model or create_ai_model()
-        self.embedding_fn = embedding_fn or GeminiEmbeddingFunction(
+        self.embedding_fn = embedding_fn or get_embedding_function(
             api_key=settings.google_api_key,
             model_name=self.embedding_model_name,
+            output_dimensionality=settings.rag_embedding_dimensions,
         )
         self.storage = storage or RAGStorageService()
+        # Cached answers may miss newly indexed meetings, so indexing clears them
+        self.answer_cache = SemanticAnswerCache(self.client, settings.rag_answer_cache_ttl)
+        # Collections already opened by this service, so indexing skips the metadata round-trip
+        self._collections: dict[str, Collection] = {}
+        # Summary requests in flight, so identical episodes summarized concurrently share one call
+        self._summary_requests: dict[str, asyncio.Task[str]] = {}
+        # Upserts embed through blocking HTTP calls; a dedicated pool lets concurrent ingests
+        # overlap without competing with other to_thread work
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.rag_index_workers, thread_name_prefix="rag-index"
+        )
         logger.info(
             "Initialized RAG indexing service with model {} (chunk_size={}, overlap={})",
             self.embedding_model_name,
@@ -102,140 +314,291 @@ class RAGIndexingService:
     ) -> list[EpisodePlanSegment]:
         """Generate or reuse an LLM-produced episode plan for the transcript."""
 
-        transcript_hash = hashlib.sha256(transcript.encode("utf-8")).hexdigest()
+        transcript_hash = _fingerprint(transcript)
         cached = self.storage.get_segmentation_plan(meeting_id)
         if cached and not forced:
             if cached.get("transcript_hash") == transcript_hash:
-                try:
-                    return [EpisodePlanSegment(**segment) for segment in cached["segments"]]
-                except Exception as exc:
-                    logger.warning("Failed to deserialize cached segmentation plan: {}", exc)
+                segments = cached["segments"]
+                if isinstance(segments, list):
+                    # Cached rows may predate validation or hold NaN confidences stored as null
+                    return self._plan_from_episodes(segments)
+                logger.warning("Ignoring cached segmentation plan without a segment list")
+
+        windows = self._segmentation_windows(transcript)
+        if len(windows) == 1:
+            plan = await self._segment_window(transcript)
+            complete = bool(plan)
+        else:
+            # Long transcripts are segmented window by window, concurrently, so no single call
+            # has to read the whole meeting and emit every episode
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_SEGMENTATIONS)
+
+            async def segment(window: _SegmentationWindow) -> list[EpisodePlanSegment]:
+                async with semaphore:
+                    return await self._segment_window(transcript[window.start : window.end])
+
+            window_plans = await asyncio.gather(*(segment(window) for window in windows))
+            logger.info("Segmented meeting {} in {} windows", meeting_id, len(windows))
+            plan, complete = self._merge_window_plans(transcript, windows, window_plans)
+
+        # Plans with placeholder windows are not cached, so the next ingest retries them
+        if plan and complete:
+            self.storage.save_segmentation_plan(
+                meeting_id=meeting_id,
+                transcript_hash=transcript_hash,
+                plan=[asdict(segment) for segment in plan],
+            )
+        return plan
 
+    async def _segment_window(self, transcript: str) -> list[EpisodePlanSegment]:
+        """Ask the LLM for an episode plan covering one transcript or transcript window."""
         prompt = self._build_segmentation_prompt(transcript)
-        response = await self.ai_model.generate_text(prompt, max_tokens=16000)
+        response = await self.ai_model.generate_text(
+            prompt, max_tokens=16000, system=_SEGMENTATION_SYSTEM_PROMPT
+        )
         if not response:
             logger.warning("Segmentation LLM returned empty response")
             return []
+        return self._parse_segmentation_response(response)
 
-        plan = self._parse_segmentation_response(response)
-        if plan:
-            self.storage.save_segmentation_plan(
-                meeting_id=meeting_id,
-                transcript_hash=transcript_hash,
-                plan=[segment.__dict__ for segment in plan],
-            )
-        return plan
+    def _segmentation_windows(self, transcript: str) -> list[_SegmentationWindow]:
+        """Split a long transcript into windows of about SEGMENTATION_WINDOW_WORDS words.
+
+        Windows end at line breaks, so speaker turns stay whole; a short tail is folded into
+        the last window. Every window after the first also starts with the last lines of the
+        previous one, about SEGMENTATION_WINDOW_OVERLAP_WORDS words. Transcripts within the
+        window size come back as a single window.
+        """
+        if _count_words(transcript) <= SEGMENTATION_WINDOW_WORDS:
+            return [_SegmentationWindow(0, 0, len(transcript))]
+
+        lines = transcript.splitlines(keepends=True)
+        offsets = list(itertools.accumulate((len(line) for line in lines), initial=0))
+        line_words = [len(line.split()) for line in lines]
+
+        # Line indices where each window's own text starts, plus the end of the transcript
+        bounds = [0]
+        word_count = 0
+        for idx, count in enumerate(line_words, 1):
+            word_count += count
+            if word_count >= SEGMENTATION_WINDOW_WORDS:
+                bounds.append(idx)
+                word_count = 0
+        if bounds[-1] != len(lines):
+            if len(bounds) > 1 and word_count < SEGMENTATION_WINDOW_WORDS // 4:
+                bounds[-1] = len(lines)
+            else:
+                bounds.append(len(lines))
+
+        overlap_words = min(SEGMENTATION_WINDOW_OVERLAP_WORDS, SEGMENTATION_WINDOW_WORDS // 4)
+        windows = []
+        for body_start, end in itertools.pairwise(bounds):
+            start, word_count = body_start, 0
+            while start > 0 and word_count < overlap_words:
+                start -= 1
+                word_count += line_words[start]
+            windows.append(_SegmentationWindow(offsets[start], offsets[body_start], offsets[end]))
+        return windows
+
+    def _merge_window_plans(
+        self,
+        transcript: str,
+        windows: list[_SegmentationWindow],
+        window_plans: list[list[EpisodePlanSegment]],
+    ) -> tuple[list[EpisodePlanSegment], bool]:
+        """Join per-window plans into one renumbered plan; the flag is False if a window failed.
+
+        Segments are located by anchor: those lying wholly in a window's overlap were already
+        planned from the previous window and are dropped, and the first remaining segment is
+        merged into the previous window's last one when it starts before that one ends or
+        shares a topic with it, so an episode cut by a window boundary stays one segment.
+        """
+        anchors = _AnchorIndex(
+            transcript.lower(),
+            (
+                anchor.strip().lower()
+                for window_plan in window_plans
+                for segment in window_plan
+                for anchor in (segment.start_anchor, segment.end_anchor)
+            ),
+        )
+        plan: list[EpisodePlanSegment] = []
+        complete = True
+        # End of plan[-1] when the next window's first segment may continue it
+        last_end: int | None = None
+        for window, window_plan in zip(windows, window_plans, strict=True):
+            if not window_plan:
+                # Keep the window's text as one episode rather than losing it between neighbours
+                complete = False
+                plan.append(self._window_placeholder_segment(transcript[window.body_start : window.end]))
+                last_end = None
+                continue
+            boundary = True
+            for segment in window_plan:
+                start, end = self._find_anchor_positions(
+                    transcript, segment.start_anchor, segment.end_anchor, anchors, window.start
+                )
+                start, end = max(start, window.start), min(end, window.end)
+                if window.start < window.body_start and end <= window.body_start:
+                    continue
+                if boundary and last_end is not None and (
+                    start < last_end or self._share_topic(plan[-1], segment)
+                ):
+                    plan[-1] = self._merge_segments(plan[-1], segment)
+                else:
+                    plan.append(segment)
+                boundary = False
+                last_end = end
+        return [replace(segment, order=order) for order, segment in enumerate(plan, 1)], complete
+
+    @staticmethod
+    def _share_topic(first: EpisodePlanSegment, second: EpisodePlanSegment) -> bool:
+        """Whether two plan segments name a common topic, or the same title if either has none."""
+        first_topics = {topic.lower() for topic in first.topics or [first.title]}
+        return not first_topics.isdisjoint(topic.lower() for topic in second.topics or [second.title])
+
+    @staticmethod
+    def _merge_segments(first: EpisodePlanSegment, second: EpisodePlanSegment) -> EpisodePlanSegment:
+        """Join two plan segments of one episode; `second` continues `first`."""
+        projects: dict[str, dict[str, Any]] = {}
+        for proj in (*first.projects, *second.projects):
+            key = normalize_alias(str(proj.get("alias") or ""))
+            if key not in projects or proj["confidence"] > projects[key]["confidence"]:
+                projects[key] = proj
+        return replace(
+            first,
+            summary=" ".join(summary for summary in (first.summary, second.summary) if summary),
+            topics=list(dict.fromkeys((*first.topics, *second.topics))),
+            projects=list(projects.values()),
+            end_anchor=second.end_anchor,
+            confidence=min(first.confidence, second.confidence),
+        )
+
+    def _window_placeholder_segment(self, window: str) -> EpisodePlanSegment:
+        """Episode spanning a failed window past its overlap; anchors are literal text."""
+        text = window.strip()
+        return EpisodePlanSegment(
+            order=0,
+            title="Unsegmented part",
+            summary="",
+            topics=[],
+            projects=[],
+            start_anchor=text[:80],
+            end_anchor=text[-80:],
+            confidence=0.0,
+        )
 
     def _build_segmentation_prompt(self, transcript: str) -> str:
-        """Build an improved segmentation prompt with examples and clear length guidance."""
+        """Build the per-transcript part of the segmentation prompt; instructions live in the system prompt."""
         trimmed = transcript.strip()
-        word_count = len(trimmed.split())
-
-        return textwrap.dedent(
-            f"""
-            You are an expert meeting analyst. Analyze the following meeting transcript and split it into coherent episodes.
-
-            IMPORTANT GUIDELINES:
-            1. Target episode length: 300-600 words (2-4 minutes of discussion)
-            2. Each episode should focus on ONE specific topic, project discussion, or decision point
-            3. When projects are mentioned, track them throughout the related discussion
-            4. Include action items, decisions, and requirements as part of the relevant episode
-            5. For multi-hour meetings, create 5-15 episodes depending on content
-
-            EPISODE STRUCTURE:
-            - order: Sequential number (1, 2, 3...)
-            - title: Short descriptive title (5-8 words)
-            - summary: 2-3 sentences capturing key points, decisions, and action items
-            - topics: List of keywords (e.g., ["deployment", "database", "API design"])
-            - projects: Array of {{"alias": "ProjectName", "confidence": 0.0-1.0, "quote": "supporting quote from transcript"}}
-            - start_anchor: Copy the FIRST 10-20 words of the episode verbatim
-            - end_anchor: Copy the LAST 10-20 words of the episode verbatim
-            - confidence: Your confidence this segmentation is correct (0.0-1.0)
-            - notes: Optional clarifications
-
-            EXAMPLES OF GOOD EPISODES:
-
-            Example 1 - Project Discussion:
-            {{
-              "order": 1,
-              "title": "PiggyBank Project Requirements Review",
-              "summary": "Team reviewed requirements for PiggyBank savings feature. Decided to implement automatic round-up transfers. Action item: Sarah to create API spec by Friday.",
-              "topics": ["requirements", "savings", "API", "round-up transfers"],
-              "projects": [{{"alias": "PiggyBank", "confidence": 0.95, "quote": "So for PiggyBank, we need to figure out the automatic savings logic"}}],
-              "start_anchor": "Alright, let's talk about the PiggyBank feature requirements.",
-              "end_anchor": "Great, so Sarah will have that spec ready by end of week.",
-              "confidence": 0.9
-            }}
-
-            Example 2 - Action Items:
-            {{
-              "order": 2,
-              "title": "Deployment Timeline and Owner Assignment",
-              "summary": "Discussed deployment schedule for Q1. John will handle staging deployment on Monday. Production rollout scheduled for next Thursday with Alex as owner.",
-              "topics": ["deployment", "timeline", "assignments", "Q1 planning"],
-              "projects": [{{"alias": "Platform Migration", "confidence": 0.7, "quote": "the migration work needs to be deployed carefully"}}],
-              "start_anchor": "Let's nail down the deployment timeline for next week.",
-              "end_anchor": "Perfect, so Alex owns the production deployment next Thursday.",
-              "confidence": 0.85
-            }}
-
-            TRANSCRIPT INFO:
-            - Total words: {word_count}
-            - Expected episodes: {max(3, word_count // 400)}
-
-            Respond ONLY with valid JSON in this exact format:
-            {{"episodes": [ ... ]}}
-
-            TRANSCRIPT:
-            {trimmed}
-            """
-        ).strip()
+        word_count = _count_words(trimmed)
+
+        return _SEGMENTATION_PROMPT_TEMPLATE.format(
+            word_count=word_count,
+            expected=max(3, word_count // 400),
+            transcript=trimmed,
+        )
 
     def _parse_segmentation_response(self, response: str) -> list[EpisodePlanSegment]:
         """Parse LLM response into episode plan segments."""
-        cleaned = response.strip()
-        if cleaned.startswith("```"):
-            cleaned = "\n".join(line for line in cleaned.splitlines() if not line.startswith("```"))
+        cleaned = _FENCE_RE.sub("", response.strip())
         try:
-            data = json.loads(cleaned)
-            episodes = data.get("episodes", [])
-            plan = []
-            for episode in episodes:
-                try:
-                    plan.append(
-                        EpisodePlanSegment(
-                            order=int(episode.get("order", len(plan) + 1)),
-                            title=episode.get("title", "Unnamed Episode"),
-                            summary=episode.get("summary", ""),
-                            topics=episode.get("topics", []) or [],
-                            projects=episode.get("projects", []) or [],
-                            start_anchor=episode.get("start_anchor", ""),
-                            end_anchor=episode.get("end_anchor", ""),
-                            confidence=float(episode.get("confidence", 0.5)),
-                            notes=episode.get("notes"),
-                        )
-                    )
-                except Exception as exc:
-                    logger.warning("Skipping malformed episode entry: {}", exc)
-            return plan
+            data = _loads_json(cleaned)
+            # Accept a bare episode list as well as the requested {"episodes": [...]} object
+            episodes = data.get("episodes", []) if isinstance(data, dict) else data
         except json.JSONDecodeError as exc:
             logger.warning("Failed to parse segmentation response as JSON: {}", exc)
             return []
+        if not isinstance(episodes, list):
+            logger.warning("Segmentation response has no episode list: {}", type(episodes).__name__)
+            return []
+        return self._plan_from_episodes(episodes)
+
+    def _plan_from_episodes(self, episodes: list[Any]) -> list[EpisodePlanSegment]:
+        """Build typed plan segments from decoded episode objects, skipping malformed entries.
 
-    def _find_anchor_positions(self, transcript: str, start_anchor: str, end_anchor: str) -> tuple[int, int]:
-        """Locate start and end anchors within the transcript, returning char indices."""
+        Nulls, wrong types and non-finite confidences become defaults here, so the anchor search
+        and metadata code downstream can rely on the declared field types.
+        """
+        plan = []
+        for episode in episodes:
+            try:
+                plan.append(
+                    EpisodePlanSegment(
+                        order=int(episode.get("order") or len(plan) + 1),
+                        title=str(episode.get("title") or "Unnamed Episode"),
+                        summary=str(episode.get("summary") or ""),
+                        topics=[str(topic) for topic in episode.get("topics") or []],
+                        projects=[
+                            {**proj, "confidence": _finite_float(proj.get("confidence"), 0.0)}
+                            for proj in episode.get("projects") or []
+                            if isinstance(proj, dict)
+                        ],
+                        start_anchor=str(episode.get("start_anchor") or ""),
+                        end_anchor=str(episode.get("end_anchor") or ""),
+                        confidence=_finite_float(episode.get("confidence"), 0.5),
+                        notes=episode.get("notes"),
+                    )
+                )
+            except Exception as exc:
+                logger.warning("Skipping malformed episode entry: {}", exc)
+        return plan
+
+    def _find_anchor_positions(
+        self,
+        transcript: str,
+        start_anchor: str,
+        end_anchor: str,
+        anchors: _AnchorIndex | None = None,
+        search_from: int = 0,
+    ) -> tuple[int, int]:
+        """Locate start and end anchors within the transcript, returning char indices.
+
+        Anchors are literal text, so they are matched case-insensitively on a lowercased
+        copy of the transcript; callers splitting many segments pass an `_AnchorIndex`
+        built once, and `search_from` to skip text already assigned to earlier episodes.
+        """
+        if anchors is None:
+            anchors = _AnchorIndex(transcript.lower())
+        if len(anchors.lowered) != len(transcript):
+            # Lowercasing changed some character widths; offsets would not line up
+            return self._find_anchor_positions_regex(transcript, start_anchor, end_anchor, search_from)
+
+        def _search(anchor: str, default: int, pos: int) -> int:
+            needle = anchor.strip().lower()
+            if not needle:
+                return default
+            idx = anchors.find(needle, pos)
+            return idx if idx != -1 else default
+
+        start = _search(start_anchor, 0, search_from)
+        end = _search(end_anchor, len(transcript), max(start, search_from))
+        if end < start:
+            end = len(transcript)
+        return start, end
 
-        def _search(anchor: str, default: int) -> int:
-            if not anchor:
+    def _find_anchor_positions_regex(
+        self,
+        transcript: str,
+        start_anchor: str,
+        end_anchor: str,
+        search_from: int = 0,
+    ) -> tuple[int, int]:
+        """Case-insensitive anchor search for transcripts whose lowercase form changes length."""
+
+        def _search(anchor: str, default: int, pos: int) -> int:
+            needle = anchor.strip()
+            if not needle:
                 return default
-            pattern = re.escape(anchor.strip())
-            match = re.search(pattern, transcript, flags=re.IGNORECASE)
-            if match:
-                return match.start()
-            return default
-
-        start = _search(start_anchor, 0)
-        end = _search(end_anchor, len(transcript))
+            # Anchors are usually copied verbatim, so an exact match avoids the regex scan
+            idx = transcript.find(needle, pos)
+            if idx != -1:
+                return idx
+            match = re.compile(re.escape(needle), flags=re.IGNORECASE).search(transcript, pos)
+            return match.start() if match else default
+
+        start = _search(start_anchor, 0, search_from)
+        end = _search(end_anchor, len(transcript), max(start, search_from))
         if end < start:
             end = len(transcript)
         return start, end
@@ -246,51 +609,31 @@ class RAGIndexingService:
 
         Returns list of (chunk_text, chunk_id) tuples.
         """
-        words = text.split()
-
         # If text fits in one chunk, return as-is
-        if len(words) <= self.chunk_size:
+        if _count_words(text) <= self.chunk_size:
             return [(text, f"{episode_id}:0")]
 
         # Split into sentences for better boundaries
-        sentences = re.split(r'(?<=[.!?])\s+', text)
+        sentences, word_counts = self._window_long_sentences(_SENTENCE_SPLIT_RE.split(text))
 
-        chunks = []
-        current_chunk = []
-        current_word_count = 0
-        chunk_idx = 0
+        # Word offsets of every piece, counted once; chunk ends and overlap starts are then
+        # binary searches instead of re-splitting sentences in the packing loop
+        offsets = [0, *itertools.accumulate(word_counts)]
 
-        for sentence in sentences:
-            sentence_words = len(sentence.split())
-
-            # If adding this sentence exceeds chunk size and we have content, save chunk
-            if current_word_count + sentence_words > self.chunk_size and current_chunk:
-                chunk_text = " ".join(current_chunk)
-                chunks.append((chunk_text, f"{episode_id}:{chunk_idx}"))
-                chunk_idx += 1
-
-                # Calculate overlap: keep last few sentences
-                overlap_word_count = 0
-                overlap_sentences = []
-                for i in range(len(current_chunk) - 1, -1, -1):
-                    sent = current_chunk[i]
-                    sent_words = len(sent.split())
-                    if overlap_word_count + sent_words <= self.chunk_overlap:
-                        overlap_sentences.insert(0, sent)
-                        overlap_word_count += sent_words
-                    else:
-                        break
-
-                current_chunk = overlap_sentences
-                current_word_count = overlap_word_count
-
-            current_chunk.append(sentence)
-            current_word_count += sentence_words
-
-        # Add final chunk
-        if current_chunk:
-            chunk_text = " ".join(current_chunk)
-            chunks.append((chunk_text, f"{episode_id}:{chunk_idx}"))
+        chunks = []
+        start = 0
+        # The piece that overflowed the previous chunk always opens the next one
+        min_end = 1
+        while True:
+            # Extend the chunk with every following piece that still fits in chunk_size words
+            fits = bisect.bisect_right(offsets, offsets[start] + self.chunk_size) - 1
+            end = min(len(sentences), max(min_end, fits))
+            chunks.append((" ".join(sentences[start:end]), f"{episode_id}:{len(chunks)}"))
+            if end >= len(sentences):
+                break
+            # Carry over the trailing pieces that fit within the overlap
+            start = max(start, bisect.bisect_left(offsets, offsets[end] - self.chunk_overlap))
+            min_end = end + 1
 
         logger.debug(
             "Split episode {} into {} chunks (size={}, overlap={})",
@@ -302,6 +645,28 @@ class RAGIndexingService:
 
         return chunks
 
+    def _window_long_sentences(self, sentences: list[str]) -> tuple[list[str], list[int]]:
+        """Cut sentences longer than a chunk into word windows; returns pieces and their word counts.
+
+        Unpunctuated stretches of transcript would otherwise become one oversized chunk that
+        the embedding model truncates. Windows are overlap-sized, so the overlap carried
+        between chunks still applies inside a long sentence.
+        """
+        window = self.chunk_overlap if 0 < self.chunk_overlap < self.chunk_size else self.chunk_size
+        pieces: list[str] = []
+        word_counts: list[int] = []
+        for sentence in sentences:
+            words = sentence.split()
+            if len(words) <= self.chunk_size:
+                pieces.append(sentence)
+                word_counts.append(len(words))
+                continue
+            for start in range(0, len(words), window):
+                piece = words[start:start + window]
+                pieces.append(" ".join(piece))
+                word_counts.append(len(piece))
+        return pieces, word_counts
+
     def _split_transcript_by_plan(
         self,
         transcript: str,
@@ -311,19 +676,24 @@ class RAGIndexingService:
         episodes: list[Episode] = []
         last_end = 0
 
+        # Sentence boundaries and anchor lookups are computed once for all segments
+        sentence_ends = [match.start() for match in _SENTENCE_END_RE.finditer(transcript)]
+        anchors = _AnchorIndex(
+            transcript.lower(),
+            (anchor.strip().lower() for segment in plan for anchor in (segment.start_anchor, segment.end_anchor)),
+        )
+
         def expand_to_sentence_boundary(idx: int) -> int:
             if idx <= 0:
                 return 0
             if idx >= len(transcript):
                 return len(transcript)
-            for match in re.finditer(r"[.!?]\s+", transcript):
-                if match.start() >= idx:
-                    return match.start()
-            return idx
+            pos = bisect.bisect_left(sentence_ends, idx)
+            return sentence_ends[pos] if pos < len(sentence_ends) else idx
 
         for segment in plan:
             start_char, end_char = self._find_anchor_positions(
-                transcript, segment.start_anchor, segment.end_anchor
+                transcript, segment.start_anchor, segment.end_anchor, anchors, last_end
             )
             if start_char < last_end:
                 start_char = last_end
@@ -346,7 +716,7 @@ class RAGIndexingService:
                     summary=segment.summary,
                     topics=segment.topics or [segment.title],
                     project_affinity={
-                        proj.get("alias", ""): float(proj.get("confidence", 0.0))
+                        proj.get("alias", ""): _finite_float(proj.get("confidence"), 0.0)
                         for proj in segment.projects or []
                         if proj.get("alias")
                     },
@@ -376,89 +746,240 @@ class RAGIndexingService:
         """Get collection name for user."""
         return f"user_{user_id}_meetings"
 
-    def ensure_namespace(self, user_id: int) -> None:
-        """Ensure a collection exists for the user."""
+    def _embedding_signature(self) -> dict[str, Any]:
+        """Embedding settings recorded on collections; vectors from other settings don't mix."""
+        return {
+            "embedding_model": getattr(self.embedding_fn, "model_name", self.embedding_model_name),
+            "embedding_dimensions": getattr(self.embedding_fn, "output_dimensionality", None) or 0,
+        }
+
+    def ensure_namespace(self, user_id: int) -> Collection:
+        """Ensure a collection exists for the user and return it."""
         collection_name = self._collection_name(user_id)
-        existing = [c.name for c in self.client.list_collections()]
-        if collection_name in existing:
-            return
-        self.client.create_collection(
+        collection = self._collections.get(collection_name)
+        if collection is not None:
+            return collection
+        # One round-trip instead of listing every collection and then creating or fetching
+        signature = self._embedding_signature()
+        collection = self.client.get_or_create_collection(
             name=collection_name,
-            metadata={"user_id": str(user_id)},
+            metadata={"user_id": str(user_id), **signature},
             embedding_function=self.embedding_fn,
         )
-        logger.info("Created vector namespace for user {}", user_id)
+        existing = collection.metadata or {}
+        for key, value in signature.items():
+            # Collections created before this metadata existed are accepted as-is
+            if key in existing and existing[key] != value:
+                raise ValueError(
+                    f"Collection {collection_name} was built with {key}={existing[key]!r}, "
+                    f"but the service is configured with {value!r}"
+                )
+        self._collections[collection_name] = collection
+        logger.info("Opened vector namespace for user {}", user_id)
+        return collection
 
     def delete_namespace(self, user_id: int) -> None:
         """Delete vector collection and metadata for a user."""
         collection_name = self._collection_name(user_id)
+        self._collections.pop(collection_name, None)
         try:
             self.client.delete_collection(collection_name)
             logger.info("Deleted vector namespace for user {}", user_id)
         except Exception as exc:
             logger.warning("Failed to delete namespace {}: {}", collection_name, exc)
+        self.answer_cache.clear(user_id)
 
-    def index_chunks(self, user_id: int, chunks: list[EpisodeChunk]) -> None:
-        """Index prepared chunks for the user."""
+    async def index_chunks(self, user_id: int, chunks: list[EpisodeChunk]) -> None:
+        """Index prepared chunks for the user on the indexing worker pool."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, functools.partial(self._upsert_chunks, user_id, chunks))
+
+    def _upsert_chunks(self, user_id: int, chunks: list[EpisodeChunk]) -> None:
+        """Upsert prepared chunks into the user's collection; blocks while chunks are embedded."""
         if not chunks:
             logger.info("No chunks to index for user {}", user_id)
             return
 
-        self.ensure_namespace(user_id)
-        collection = self.client.get_collection(
-            name=self._collection_name(user_id),
-            embedding_function=self.embedding_fn,
-        )
+        collection = self.ensure_namespace(user_id)
 
-        ids = [chunk.chunk_id for chunk in chunks]
-        documents = [chunk.text for chunk in chunks]
-        metadatas = [self._chunk_metadata(chunk) for chunk in chunks]
+        # Sub-chunks of one episode share their summary, topics and project tags
+        episode_fields: dict[str, tuple[dict[str, Any], dict[str, Any]]] = {}
 
         try:
-            collection.upsert(ids=ids, documents=documents, metadatas=metadatas)
+            # Large backfills are split to stay under Chroma's maximum batch size; each batch's
+            # columns are built in one pass, so only one batch of metadata is held at a time
+            for start in range(0, len(chunks), UPSERT_BATCH_SIZE):
+                ids, documents, metadatas = [], [], []
+                for chunk in chunks[start:start + UPSERT_BATCH_SIZE]:
+                    fields = episode_fields.get(chunk.episode_id)
+                    if fields is None:
+                        fields = episode_fields[chunk.episode_id] = self._episode_metadata_fields(chunk)
+                    ids.append(chunk.chunk_id)
+                    documents.append(chunk.text)
+                    metadatas.append(self._chunk_metadata(chunk, fields))
+                collection.upsert(ids=ids, documents=documents, metadatas=metadatas)
             logger.info("Indexed {} chunks for user {}", len(chunks), user_id)
         except Exception as exc:
             logger.error("Failed to upsert chunks: {}", exc)
             raise
 
-    def _chunk_metadata(self, chunk: EpisodeChunk) -> dict[str, Any]:
-        """Prepare chunk metadata for indexing."""
-        metadata = {
+    def _chunk_metadata(
+        self,
+        chunk: EpisodeChunk,
+        episode_fields: tuple[dict[str, Any], dict[str, Any]] | None = None,
+    ) -> dict[str, Any]:
+        """Prepare chunk metadata for indexing.
+
+        `episode_fields` is the result of `_episode_metadata_fields` for the chunk's episode;
+        callers indexing many sub-chunks of one episode pass it to skip recomputing it.
+        """
+        base, project_fields = episode_fields or self._episode_metadata_fields(chunk)
+        metadata = {**base, **chunk.metadata}
+        if chunk.start_time is not None:
+            metadata["start_time"] = chunk.start_time
+        if chunk.end_time is not None:
+            metadata["end_time"] = chunk.end_time
+        metadata.update(project_fields)
+        return metadata
+
+    def _episode_metadata_fields(self, chunk: EpisodeChunk) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Metadata shared by every sub-chunk of an episode: base fields and project tags."""
+        base = {
             "meeting_id": chunk.meeting_id,
             "episode_id": chunk.episode_id,
             "summary": chunk.summary,
-            "project_affinity": json.dumps(chunk.project_affinity),
+            "project_affinity": orjson.dumps(chunk.project_affinity).decode(),
             "topics": ",".join(chunk.topics),
         }
-        metadata.update(chunk.metadata)
-        if chunk.start_time is not None:
-            metadata["start_time"] = chunk.start_time
-        if chunk.end_time is not None:
-            metadata["end_time"] = chunk.end_time
 
         # Extract primary project for filtering
         project_items = sorted(
             (
-                (alias, float(score), self._normalize_alias(alias))
+                (alias, float(score), normalize_alias(alias))
                 for alias, score in chunk.project_affinity.items()
                 if alias
             ),
             key=lambda item: item[1],
             reverse=True,
         )
+        project_fields: dict[str, Any] = {}
         if project_items:
             top_alias, top_score, top_norm = project_items[0]
-            metadata["primary_project"] = top_alias
-            metadata["primary_project_norm"] = top_norm
-            metadata["primary_project_score"] = top_score
-            metadata["project_tags"] = ",".join(alias for alias, _, _ in project_items)
-            metadata["project_tags_norm"] = ",".join(norm for _, _, norm in project_items)
-        return metadata
+            project_fields["primary_project"] = top_alias
+            project_fields["primary_project_norm"] = top_norm
+            project_fields["primary_project_score"] = top_score
+            project_fields["project_tags"] = ",".join(alias for alias, _, _ in project_items)
+            project_fields["project_tags_norm"] = ",".join(norm for _, _, norm in project_items)
+            # Scalar per-project fields let queries filter on any strong project, not just the top one
+            for _, score, norm in project_items[:MAX_PROJECT_SCORE_FIELDS]:
+                if norm:
+                    project_fields[project_score_field(norm)] = score
+        return base, project_fields
+
+    async def _summarize_episode(self, text: str) -> str:
+        """Summarize an episode, reusing the cached summary for identical episode text."""
+        excerpt = text[:2000]
+        text_hash = _fingerprint(_SUMMARY_CACHE_VERSION + excerpt)
+        cached = self.storage.get_episode_summary(text_hash)
+        if cached:
+            return cached
+
+        request = self._summary_requests.get(text_hash)
+        if request is None:
+            request = asyncio.create_task(self._request_summary(text_hash, excerpt))
+            self._summary_requests[text_hash] = request
+            request.add_done_callback(lambda _: self._summary_requests.pop(text_hash, None))
+        # Shielded so one cancelled waiter does not cancel the request others are awaiting
+        return await asyncio.shield(request)
+
+    async def _request_summary(self, text_hash: str, excerpt: str) -> str:
+        """Ask the LLM for an episode summary and cache a non-empty result."""
+        summary = await self.ai_model.generate_text(
+            _SUMMARY_PROMPT_TEMPLATE.format(excerpt=excerpt), max_tokens=300, system=_SUMMARY_SYSTEM_PROMPT
+        ) or ""
+        if summary:
+            self.storage.save_episode_summary(text_hash, summary)
+        return summary
+
+    async def _segment_meeting(self, user_id: int, meeting_id: str, transcript: str) -> list[Episode]:
+        """Split a meeting transcript into episodes with their ids assigned."""
+        logger.info("Ingesting meeting {} for user {}", meeting_id, user_id)
+        plan = await self.generate_segmentation_plan(meeting_id, transcript)
+        episodes = self._split_transcript_by_plan(transcript, plan)
+        for idx, episode in enumerate(episodes):
+            episode.episode_id = f"{meeting_id}:episode:{idx}"
+            episode.meeting_id = meeting_id
+        return episodes
 
-    def _normalize_alias(self, alias: str) -> str:
-        """Normalize project alias for consistent matching."""
-        cleaned = re.sub(r"[^a-z0-9]+", "_", alias.lower())
-        return cleaned.strip("_")
+    async def _fill_summary(self, episode: Episode, semaphore: asyncio.Semaphore) -> None:
+        """Summarize an episode that has no plan summary, within the concurrency limit."""
+        async with semaphore:
+            try:
+                episode.summary = await self._summarize_episode(episode.text)
+            except Exception as exc:
+                # One failed summary should not abort indexing of the whole meeting
+                logger.warning("Failed to summarize episode {}: {}", episode.episode_id, exc)
+
+    def _episode_chunks(self, episode: Episode, meeting_metadata: dict[str, Any]) -> list[EpisodeChunk]:
+        """Build the indexable chunks of one episode, splitting large episodes into sub-chunks."""
+        sub_chunks = self._split_large_text_into_chunks(episode.text, episode.episode_id)
+        return [
+            EpisodeChunk(
+                chunk_id=chunk_id,
+                text=chunk_text,
+                summary=episode.summary,
+                meeting_id=episode.meeting_id,
+                episode_id=episode.episode_id,
+                start_time=episode.start_time,
+                end_time=episode.end_time,
+                project_affinity=episode.project_affinity,
+                topics=episode.topics,
+                metadata={
+                    **meeting_metadata,
+                    "start_char": episode.start_char,
+                    "end_char": episode.end_char,
+                    "sub_chunk_index": sub_idx,
+                    "total_sub_chunks": len(sub_chunks),
+                },
+            )
+            for sub_idx, (chunk_text, chunk_id) in enumerate(sub_chunks)
+        ]
+
+    def _track_projects(self, user_id: int, episodes: list[Episode]) -> None:
+        """Update the project tracker in episode order."""
+        for episode in episodes:
+            self.storage.upsert_projects(user_id, episode.project_affinity)
+
+    async def _prepare_meeting(
+        self,
+        user_id: int,
+        meeting_id: str,
+        transcript: str,
+        meeting_metadata: dict[str, Any],
+        on_chunks: Callable[[list[EpisodeChunk]], Awaitable[None]] | None = None,
+    ) -> tuple[list[Episode], list[EpisodeChunk]]:
+        """Segment and summarize a meeting transcript into chunks ready for indexing.
+
+        `on_chunks` receives each episode's chunks as soon as its summary is ready, so a
+        caller can index early episodes while later summary requests are still in flight.
+        """
+        episodes = await self._segment_meeting(user_id, meeting_id, transcript)
+        # Project affinity comes from the plan, so tracking does not wait on summaries or upserts
+        self._track_projects(user_id, episodes)
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_SUMMARIES)
+
+        async def prepare_episode(episode: Episode) -> list[EpisodeChunk]:
+            if not episode.summary:
+                await self._fill_summary(episode, semaphore)
+            chunks = self._episode_chunks(episode, meeting_metadata)
+            if on_chunks is not None:
+                await on_chunks(chunks)
+            return chunks
+
+        # Summaries are independent LLM round-trips, so request the missing ones concurrently
+        episode_chunks = await asyncio.gather(*(prepare_episode(episode) for episode in episodes))
+        return episodes, [chunk for chunks in episode_chunks for chunk in chunks]
 
     async def ingest_meeting(
         self,
@@ -467,59 +988,61 @@ class RAGIndexingService:
         transcript: str,
         meeting_metadata: dict[str, Any],
     ) -> list[Episode]:
-        """Segment, summarize, and index a meeting transcript."""
+        """Segment, summarize, and index a meeting transcript.
 
-        logger.info("Ingesting meeting {} for user {}", meeting_id, user_id)
-        plan = await self.generate_segmentation_plan(meeting_id, transcript)
-        episodes = self._split_transcript_by_plan(transcript, plan)
+        Each episode is indexed as soon as its summary is ready, so embedding and writing
+        earlier episodes overlaps with the summary requests still in flight.
+        """
+        loop = asyncio.get_running_loop()
+        # Open the collection before the per-episode upserts so they don't race to create it
+        await loop.run_in_executor(self._executor, self.ensure_namespace, user_id)
 
-        indexed_chunks: list[EpisodeChunk] = []
+        errors: list[Exception] = []
 
-        for idx, episode in enumerate(episodes):
-            episode_id = f"{meeting_id}:episode:{idx}"
-            episode.episode_id = episode_id
-            episode.meeting_id = meeting_id
+        async def index_episode(chunks: list[EpisodeChunk]) -> None:
+            try:
+                await self.index_chunks(user_id, chunks)
+            except Exception as exc:
+                # The remaining episodes are still indexed; the first failure is raised afterwards
+                errors.append(exc)
 
-            # Generate summary if not present
-            if not episode.summary:
-                summary_prompt = textwrap.dedent(
-                    f"""
-                    Summarize this meeting episode in 2-3 sentences.
-                    Focus on: key decisions, action items, requirements discussed, and owners/deadlines if mentioned.
-
-                    Episode:
-                    {episode.text[:2000]}
-                    """
-                )
-                episode.summary = await self.ai_model.generate_text(summary_prompt, max_tokens=300) or ""
-
-            # Split large episodes into sub-chunks
-            sub_chunks = self._split_large_text_into_chunks(episode.text, episode_id)
-
-            for sub_idx, (chunk_text, chunk_id) in enumerate(sub_chunks):
-                chunk = EpisodeChunk(
-                    chunk_id=chunk_id,
-                    text=chunk_text,
-                    summary=episode.summary,
-                    meeting_id=meeting_id,
-                    episode_id=episode_id,
-                    start_time=episode.start_time,
-                    end_time=episode.end_time,
-                    project_affinity=episode.project_affinity,
-                    topics=episode.topics,
-                    metadata={
-                        **meeting_metadata,
-                        "start_char": episode.start_char,
-                        "end_char": episode.end_char,
-                        "sub_chunk_index": sub_idx,
-                        "total_sub_chunks": len(sub_chunks),
-                    },
-                )
-                indexed_chunks.append(chunk)
+        episodes, chunks = await self._prepare_meeting(
+            user_id, meeting_id, transcript, meeting_metadata, on_chunks=index_episode
+        )
+        # Cached answers predate the new chunks; cleared once per ingest, even after a partial write
+        await loop.run_in_executor(self._executor, self.answer_cache.clear, user_id)
+        if errors:
+            # Episodes already written keep their deterministic chunk ids, so a retry overwrites them
+            for error in errors:
+                logger.error("Failed to index an episode of meeting {}: {}", meeting_id, error)
+            raise errors[0]
+        logger.info("Successfully ingested meeting {}: {} episodes, {} chunks", meeting_id, len(episodes), len(chunks))
+        return episodes
 
-            # Update project tracker
-            self.storage.upsert_projects(user_id, episode.project_affinity)
+    async def ingest_meetings_batch(
+        self,
+        user_id: int,
+        meetings: list[tuple[str, str, dict[str, Any]]],
+    ) -> dict[str, list[Episode]]:
+        """Segment and summarize several meetings, then index all their chunks together.
+
+        Args:
+            user_id: Owner of the meetings
+            meetings: (meeting_id, transcript, meeting_metadata) for each meeting
+
+        Returns:
+            Episodes per meeting id
+        """
+        episodes_by_meeting: dict[str, list[Episode]] = {}
+        all_chunks: list[EpisodeChunk] = []
+        for meeting_id, transcript, meeting_metadata in meetings:
+            episodes, chunks = await self._prepare_meeting(
+                user_id, meeting_id, transcript, meeting_metadata
+            )
+            episodes_by_meeting[meeting_id] = episodes
+            all_chunks.extend(chunks)
 
-        self.index_chunks(user_id, indexed_chunks)
-        logger.info("Successfully ingested meeting {}: {} episodes, {} chunks", meeting_id, len(episodes), len(indexed_chunks))
-        return episodes
\ No newline at end of file
+        await self.index_chunks(user_id, all_chunks)
+        await asyncio.get_running_loop().run_in_executor(self._executor, self.answer_cache.clear, user_id)
+        logger.info("Successfully ingested {} meetings: {} chunks", len(meetings), len(all_chunks))
+        return episodes_by_meeting
\ No newline at end of file
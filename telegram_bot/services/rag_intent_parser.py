@@ -1,13 +1,100 @@
 """Intent parsing service for free-form RAG queries."""
 
+import hashlib
 import json
+import re
+import textwrap
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Any, Optional
 
+import orjson
 from loguru import logger
 
 from telegram_bot.services.ai_model import AIModel, create_ai_model
 
+# Parsed intents kept per parser for repeated messages
+INTENT_CACHE_SIZE = 256
+
+# Intents below this confidence are not cached, so a poor guess is not repeated
+MIN_CACHED_CONFIDENCE = 0.5
+
+# Markdown code fence (```json ... ```) wrapped around an LLM JSON response
+_FENCE_RE = re.compile(r"\A```[^\n]*\n?|\n?```\s*\Z")
+
+# Static intent instructions and examples, sent as the system prompt so providers can cache
+# them; only the message and previous intent vary per request
+_INTENT_SYSTEM_PROMPT = textwrap.dedent(
+    """
+    You are an intent classification assistant for a meeting knowledge base.
+    Convert the user message into a structured JSON object.
+
+    **SCHEMA:**
+    {
+      "intent": "project_summary" | "date_summary" | "general_question" | "action_items" | "topics_overview" | "requirements_query",
+      "projects": [{"alias": "ProjectName", "confidence": 0.0-1.0}],
+      "date_ranges": [{"start": "date_expression", "end": "date_expression"}],
+      "topics": ["topic1", "topic2"],
+      "follow_up": boolean,
+      "confidence": 0.0-1.0,
+      "uncertainty_reason": string | null
+    }
+
+    **RULES:**
+    - Return ONLY valid JSON, no markdown or commentary
+    - Extract project names even from indirect references ("the banking app" → "banking")
+    - Detect relative dates ("yesterday", "last week", "this month")
+    - Set confidence < 0.5 if unsure, explain in uncertainty_reason
+    - For follow-up questions referencing "it", "that project", etc., mark follow_up=true
+
+    **EXAMPLES:**
+
+    Message: "What actions did we decide on for PiggyBank yesterday?"
+    {
+      "intent": "action_items",
+      "projects": [{"alias": "PiggyBank", "confidence": 0.95}],
+      "date_ranges": [{"start": "yesterday", "end": "yesterday"}],
+      "topics": ["actions", "decisions"],
+      "follow_up": false,
+      "confidence": 0.9,
+      "uncertainty_reason": null
+    }
+
+    Message: "Remind me all requirements we discussed about piggybank from all calls"
+    {
+      "intent": "requirements_query",
+      "projects": [{"alias": "PiggyBank", "confidence": 0.9}],
+      "date_ranges": [],
+      "topics": ["requirements", "features"],
+      "follow_up": false,
+      "confidence": 0.85,
+      "uncertainty_reason": null
+    }
+
+    Message: "What new project ideas did we discuss this week?"
+    {
+      "intent": "topics_overview",
+      "projects": [],
+      "date_ranges": [{"start": "this week", "end": "today"}],
+      "topics": ["new projects", "ideas", "brainstorming"],
+      "follow_up": false,
+      "confidence": 0.8,
+      "uncertainty_reason": null
+    }
+
+    Message: "What are my action items from this week's discussions?"
+    {
+      "intent": "action_items",
+      "projects": [],
+      "date_ranges": [{"start": "this week", "end": "today"}],
+      "topics": ["action items", "tasks", "assignments"],
+      "follow_up": false,
+      "confidence": 0.85,
+      "uncertainty_reason": null
+    }
+    """
+).strip()
+
 
 @dataclass
 class ParsedIntent:
@@ -27,39 +114,50 @@ class RAGIntentParser:
 
     def __init__(self, ai_model: Optional[AIModel] = None) -> None:
         self.ai_model = ai_model or create_ai_model()
+        # Recently parsed intents by message and previous intent, least recently used first;
+        # cached intents are returned as-is, so callers must not mutate them
+        self._cache: OrderedDict[str, ParsedIntent] = OrderedDict()
         logger.info("RAG intent parser initialized")
 
     async def parse(self, message: str, context: Optional[dict[str, Any]] = None) -> ParsedIntent:
         """Parse a free-form message into a structured intent."""
 
         context = context or {}
+        key = self._cache_key(message, context)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            logger.debug("Using cached RAG intent for message: {}", message[:200])
+            return cached
+
         prompt = self._build_prompt(message, context)
 
         logger.debug("Parsing RAG intent for message: {}", message[:200])
 
-        response = await self.ai_model.generate_text(prompt, max_tokens=1000)
+        response = await self.ai_model.generate_text(prompt, max_tokens=1000, system=_INTENT_SYSTEM_PROMPT)
 
         if not response:
             logger.warning("Intent parser returned empty response; using fallback")
             return self._fallback_intent("empty_response")
 
         try:
-            data = self._extract_json(response)
-            parsed = ParsedIntent(
-                intent=data.get("intent", "general_question"),
-                projects=data.get("projects", []),
-                date_ranges=data.get("date_ranges", []),
-                topics=data.get("topics", []),
-                follow_up=data.get("follow_up", False),
-                confidence=float(data.get("confidence", 0.0)),
-                uncertainty_reason=data.get("uncertainty_reason"),
-            )
+            parsed = self._intent_from_json(self._extract_json(response))
             logger.debug("Parsed intent: {}", parsed)
-            return parsed
         except Exception as exc:
             logger.warning("Failed to parse intent response: {}", exc)
             return self._fallback_intent("parse_error")
 
+        if parsed.confidence >= MIN_CACHED_CONFIDENCE:
+            self._cache[key] = parsed
+            if len(self._cache) > INTENT_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return parsed
+
+    def _cache_key(self, message: str, context: dict[str, Any]) -> str:
+        """Cache key for a message and the previous intent it may follow up on."""
+        previous = json.dumps(context.get("previous_intent"), sort_keys=True, default=str)
+        return hashlib.blake2b(f"{message}|{previous}".encode("utf-8"), digest_size=16).hexdigest()
+
     def _fallback_intent(self, reason: str) -> ParsedIntent:
         """Create fallback intent when parsing fails."""
         return ParsedIntent(
@@ -73,87 +171,30 @@ class RAGIntentParser:
         )
 
     def _build_prompt(self, message: str, context: dict[str, Any]) -> str:
-        """Build intent parsing prompt with examples."""
+        """Build the per-message part of the intent prompt; instructions live in the system prompt."""
         previous = context.get("previous_intent")
-        previous_section = f"\nPrevious intent: {json.dumps(previous)}\n" if previous else ""
-
-        return f"""You are an intent classification assistant for a meeting knowledge base.
-Convert the user message into a structured JSON object.
-
-**SCHEMA:**
-{{
-  "intent": "project_summary" | "date_summary" | "general_question" | "action_items" | "topics_overview" | "requirements_query",
-  "projects": [{{"alias": "ProjectName", "confidence": 0.0-1.0}}],
-  "date_ranges": [{{"start": "date_expression", "end": "date_expression"}}],
-  "topics": ["topic1", "topic2"],
-  "follow_up": boolean,
-  "confidence": 0.0-1.0,
-  "uncertainty_reason": string | null
-}}
-
-**RULES:**
-- Return ONLY valid JSON, no markdown or commentary
-- Extract project names even from indirect references ("the banking app" → "banking")
-- Detect relative dates ("yesterday", "last week", "this month")
-- Set confidence < 0.5 if unsure, explain in uncertainty_reason
-- For follow-up questions referencing "it", "that project", etc., mark follow_up=true{previous_section}
-
-**EXAMPLES:**
-
-Message: "What actions did we decide on for PiggyBank yesterday?"
-{{
-  "intent": "action_items",
-  "projects": [{{"alias": "PiggyBank", "confidence": 0.95}}],
-  "date_ranges": [{{"start": "yesterday", "end": "yesterday"}}],
-  "topics": ["actions", "decisions"],
-  "follow_up": false,
-  "confidence": 0.9,
-  "uncertainty_reason": null
-}}
-
-Message: "Remind me all requirements we discussed about piggybank from all calls"
-{{
-  "intent": "requirements_query",
-  "projects": [{{"alias": "PiggyBank", "confidence": 0.9}}],
-  "date_ranges": [],
-  "topics": ["requirements", "features"],
-  "follow_up": false,
-  "confidence": 0.85,
-  "uncertainty_reason": null
-}}
-
-Message: "What new project ideas did we discuss this week?"
-{{
-  "intent": "topics_overview",
-  "projects": [],
-  "date_ranges": [{{"start": "this week", "end": "today"}}],
-  "topics": ["new projects", "ideas", "brainstorming"],
-  "follow_up": false,
-  "confidence": 0.8,
-  "uncertainty_reason": null
-}}
-
-Message: "What are my action items from this week's discussions?"
-{{
-  "intent": "action_items",
-  "projects": [],
-  "date_ranges": [{{"start": "this week", "end": "today"}}],
-  "topics": ["action items", "tasks", "assignments"],
-  "follow_up": false,
-  "confidence": 0.85,
-  "uncertainty_reason": null
-}}
-
-**MESSAGE TO PARSE:**
-{message}
-
-**OUTPUT (JSON only):**
-"""
-
-    def _extract_json(self, response: str) -> dict[str, Any]:
+        previous_section = f"Previous intent: {json.dumps(previous)}\n\n" if previous else ""
+        return f"{previous_section}**MESSAGE TO PARSE:**\n{message}\n\n**OUTPUT (JSON only):**\n"
+
+    def _extract_json(self, response: str) -> Any:
         """Extract JSON from LLM response, handling markdown wrappers."""
-        response = response.strip()
-        if response.startswith("```"):
-            lines = [line for line in response.splitlines() if not line.startswith("```")]
-            response = "\n".join(lines).strip()
-        return json.loads(response)
\ No newline at end of file
+        return orjson.loads(_FENCE_RE.sub("", response.strip()))
+
+    def _intent_from_json(self, data: Any) -> ParsedIntent:
+        """Validate decoded intent JSON in one pass, replacing nulls with defaults.
+
+        Raises ValueError or TypeError when the response is not an intent object or a
+        field cannot be coerced to its declared type.
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"intent response is {type(data).__name__}, not an object")
+        reason = data.get("uncertainty_reason")
+        return ParsedIntent(
+            intent=str(data.get("intent") or "general_question"),
+            projects=[project for project in data.get("projects") or [] if isinstance(project, dict)],
+            date_ranges=[date_range for date_range in data.get("date_ranges") or [] if isinstance(date_range, dict)],
+            topics=[str(topic) for topic in data.get("topics") or []],
+            follow_up=data.get("follow_up") is True,
+            confidence=float(data.get("confidence") or 0.0),
+            uncertainty_reason=str(reason) if reason is not None else None,
+        )
\ No newline at end of file
@@ -1,17 +1,29 @@
 """Service orchestrating retrieval and answer generation for RAG queries."""
 
-import json
+import asyncio
 from typing import Any
 
-from chromadb import PersistentClient
+import orjson
 from chromadb.api import ClientAPI
 from loguru import logger
 
 from telegram_bot.config import get_settings
 from telegram_bot.services.ai_model import AIModel, create_ai_model
-from telegram_bot.services.gemini_embedding import GeminiEmbeddingFunction
+from telegram_bot.services.chroma_client import create_chroma_client
+from telegram_bot.services.gemini_embedding import (
+    GeminiEmbeddingFunction,
+    get_embedding_function,
+)
+from telegram_bot.services.rag_answer_cache import SemanticAnswerCache, answer_cache_key
+from telegram_bot.services.rag_indexing_service import (
+    normalize_alias,
+    project_score_field,
+)
 from telegram_bot.services.rag_intent_parser import ParsedIntent
 
+# Minimum chunk affinity for a project filter to match on the per-project score fields
+MIN_PROJECT_AFFINITY = 0.5
+
 
 class RAGQueryService:
     """Execute RAG queries using vector search and structured metadata."""
@@ -26,12 +38,18 @@ class RAGQueryService:
         settings = get_settings()
         self.base_path = settings.temp_dir
         self.embedding_model_name = embedding_model or settings.rag_embedding_model
-        self.client: ClientAPI = client or PersistentClient(path=f"{self.base_path}/chroma")
+        self.client: ClientAPI = client or create_chroma_client(
+            path=f"{self.base_path}/chroma",
+            host=settings.chroma_host,
+            port=settings.chroma_port,
+        )
         self.ai_model = ai_model or create_ai_model()
-        self.embedding_fn = embedding_fn or GeminiEmbeddingFunction(
+        self.embedding_fn = embedding_fn or get_embedding_function(
             api_key=settings.google_api_key,
             model_name=self.embedding_model_name,
+            output_dimensionality=settings.rag_embedding_dimensions,
         )
+        self.answer_cache = SemanticAnswerCache(self.client, settings.rag_answer_cache_ttl)
         self.retrieval_k = settings.rag_retrieval_k
         self.similarity_threshold = settings.rag_similarity_threshold
         logger.info(
@@ -56,16 +74,43 @@ class RAGQueryService:
             logger.warning("No collection found for user {}; returning fallback", user_id)
             return None
 
+        existing = collection.metadata or {}
+        dimensions = getattr(self.embedding_fn, "output_dimensionality", None) or 0
+        if existing.get("embedding_dimensions", dimensions) != dimensions:
+            logger.warning(
+                "Collection for user {} holds {}-dimensional embeddings, query uses {}; returning fallback",
+                user_id,
+                existing["embedding_dimensions"],
+                dimensions,
+            )
+            return None
+
         # Build filter from intent
         query_filter = self._build_filter(intent)
         logger.debug("Query filter: {}", query_filter)
 
+        # Embed the question once for both the answer cache and the vector search; it is a
+        # blocking HTTP call, so run it in a thread
+        query_embedding = (await asyncio.to_thread(self.embedding_fn, [message]))[0]
+        if not query_embedding:
+            logger.warning("Could not embed query for user {}; returning fallback", user_id)
+            return None
+
+        # Follow-ups depend on earlier turns, so only standalone questions share answers
+        cache_key = None
+        if self.answer_cache.enabled and not intent.follow_up:
+            cache_key = answer_cache_key(intent.intent, query_filter)
+            cached = await asyncio.to_thread(self.answer_cache.lookup, user_id, cache_key, query_embedding)
+            if cached:
+                return cached
+
         # Adjust retrieval count based on query complexity
         n_results = self._determine_retrieval_count(intent, message)
 
         # Perform vector search
-        results = collection.query(
-            query_texts=[message],
+        results = await asyncio.to_thread(
+            collection.query,
+            query_embeddings=[query_embedding],
             n_results=n_results,
             where=query_filter or None,
         )
@@ -97,7 +142,10 @@ class RAGQueryService:
         response = await self.ai_model.generate_text(prompt, max_tokens=8000)
         if not response:
             return None
-        return response.strip()
+        answer = response.strip()
+        if cache_key:
+            await asyncio.to_thread(self.answer_cache.store, user_id, cache_key, message, query_embedding, answer)
+        return answer
 
     def _determine_retrieval_count(self, intent: ParsedIntent, message: str) -> int:
         """Determine optimal retrieval count based on query characteristics."""
@@ -129,7 +177,7 @@ class RAGQueryService:
     ) -> list[dict[str, Any]]:
         """Filter results by similarity threshold and prepare for prompting."""
         filtered = []
-        for doc, meta, dist in zip(documents, metadatas, distances):
+        for doc, meta, dist in zip(documents, metadatas, distances, strict=True):
             # ChromaDB uses L2 distance; lower is better
             # Typical good matches are < 0.7
             if dist <= self.similarity_threshold:
@@ -142,7 +190,7 @@ class RAGQueryService:
 
     def _build_filter(self, intent: ParsedIntent) -> dict[str, Any] | None:
         """Build metadata filter from parsed intent."""
-        filters: dict[str, Any] = {}
+        filters: list[dict[str, Any]] = []
 
         # Filter by projects (if high confidence)
         project_ids = [
@@ -151,18 +199,26 @@ class RAGQueryService:
             if project.get("confidence", 0) >= 0.5 and project.get("alias")
         ]
         if project_ids:
-            # Use normalized project names for filtering
-            normalized = [p.lower().replace(" ", "_") for p in project_ids]
-            filters["primary_project_norm"] = {"$in": normalized}
+            # Normalize the same way chunks were tagged at indexing time
+            normalized = [normalize_alias(p) for p in project_ids]
+            # Match chunks where the project is primary, or strong enough to have a score field
+            project_filters = [{"primary_project_norm": {"$in": normalized}}]
+            project_filters.extend(
+                {project_score_field(norm): {"$gte": MIN_PROJECT_AFFINITY}} for norm in normalized if norm
+            )
+            filters.append(project_filters[0] if len(project_filters) == 1 else {"$or": project_filters})
 
         # Filter by date if available
         if intent.date_ranges:
             # For simplicity, use first date range
             date_range = intent.date_ranges[0]
             if date_range.get("start"):
-                filters["meeting_date"] = {"$gte": date_range["start"]}
+                filters.append({"meeting_date": {"$gte": date_range["start"]}})
 
-        return filters if filters else None
+        # Chroma takes a single top-level condition per where clause
+        if not filters:
+            return None
+        return filters[0] if len(filters) == 1 else {"$and": filters}
 
     def _build_answer_prompt(
         self,
@@ -183,8 +239,8 @@ class RAGQueryService:
             project_affinity = meta.get("project_affinity", "{}")
             try:
                 if isinstance(project_affinity, str):
-                    project_affinity = json.loads(project_affinity)
-            except json.JSONDecodeError:
+                    project_affinity = orjson.loads(project_affinity)
+            except orjson.JSONDecodeError:
                 project_affinity = {}
 
             snippet = {
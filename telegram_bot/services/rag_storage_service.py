@@ -7,6 +7,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
+import orjson
 from loguru import logger
 
 from telegram_bot.config import get_settings
@@ -70,6 +71,12 @@ class RAGStorageService:
                     plan_json TEXT,
                     updated_at TEXT
                 );
+
+                CREATE TABLE IF NOT EXISTS rag_summary_cache (
+                    text_hash TEXT PRIMARY KEY,
+                    summary TEXT,
+                    updated_at TEXT
+                );
                 """
             )
 
@@ -154,7 +161,7 @@ class RAGStorageService:
                 INSERT OR REPLACE INTO rag_segmentation_cache(meeting_id, transcript_hash, plan_json, updated_at)
                 VALUES(?, ?, ?, ?)
                 """,
-                (meeting_id, transcript_hash, json.dumps(plan), now),
+                (meeting_id, transcript_hash, orjson.dumps(plan, option=orjson.OPT_SORT_KEYS).decode(), now),
             )
         logger.debug("Cached segmentation plan for meeting {}", meeting_id)
 
@@ -168,10 +175,40 @@ class RAGStorageService:
             row = cur.fetchone()
             if not row:
                 return None
-            return {
-                "transcript_hash": row["transcript_hash"],
-                "segments": json.loads(row["plan_json"] or "[]"),
-            }
+        plan_json = row["plan_json"] or "[]"
+        try:
+            segments = orjson.loads(plan_json)
+        except orjson.JSONDecodeError:
+            # Rows written with json.dumps may hold NaN/Infinity, which only the stdlib reads
+            try:
+                segments = json.loads(plan_json)
+            except ValueError as exc:
+                logger.warning("Ignoring unreadable segmentation cache for meeting {}: {}", meeting_id, exc)
+                return None
+        return {"transcript_hash": row["transcript_hash"], "segments": segments}
+
+    def save_episode_summary(self, text_hash: str, summary: str) -> None:
+        """Cache an LLM-generated episode summary by the hash of the episode text."""
+        now = datetime.utcnow().isoformat()
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO rag_summary_cache(text_hash, summary, updated_at)
+                VALUES(?, ?, ?)
+                """,
+                (text_hash, summary, now),
+            )
+        logger.debug("Cached episode summary {}", text_hash[:12])
+
+    def get_episode_summary(self, text_hash: str) -> Optional[str]:
+        """Retrieve a cached episode summary by the hash of the episode text."""
+        with self._connect() as conn:
+            cur = conn.execute(
+                "SELECT summary FROM rag_summary_cache WHERE text_hash=?",
+                (text_hash,),
+            )
+            row = cur.fetchone()
+        return row["summary"] if row else None
 
     def upsert_projects(self, user_id: int, projects: dict[str, float]) -> None:
         """Update project tracker with newly discovered projects."""
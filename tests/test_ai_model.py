@@ -89,6 +89,22 @@ class TestClaudeModel:
                 messages=[{"role": "user", "content": "Test prompt"}]
             )
 
+    @pytest.mark.asyncio
+    async def test_generate_text_with_cached_system_prompt(self):
+        """Test that a system prompt is sent as a cacheable block."""
+        with patch("telegram_bot.services.ai_model.AsyncAnthropic") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client_class.return_value = mock_client
+            mock_message = MagicMock()
+            mock_message.content = [MagicMock(text="Generated text")]
+            mock_client.messages.create = AsyncMock(return_value=mock_message)
+
+            model = ClaudeModel(api_key="test_key")
+            await model.generate_text("Test prompt", system="Instructions")
+
+            system = mock_client.messages.create.call_args.kwargs["system"]
+            assert system == [{"type": "text", "text": "Instructions", "cache_control": {"type": "ephemeral"}}]
+
     @pytest.mark.asyncio
     async def test_generate_text_failure(self):
         """Test text generation failure with Claude."""
@@ -0,0 +1,36 @@
+"""Tests for the shared Chroma client factory."""
+
+from unittest.mock import patch
+
+from telegram_bot.services.chroma_client import create_chroma_client
+
+
+class TestCreateChromaClient:
+    """Test the create_chroma_client function."""
+
+    def test_uses_embedded_store_without_host(self):
+        """Test that the embedded store is opened when no server host is set."""
+        with (
+            patch("telegram_bot.services.chroma_client.PersistentClient") as persistent,
+            patch("telegram_bot.services.chroma_client.HttpClient") as http,
+        ):
+            client = create_chroma_client("/tmp/chroma")
+
+        assert client is persistent.return_value
+        assert persistent.call_args.kwargs["path"] == "/tmp/chroma"
+        http.assert_not_called()
+
+    def test_connects_to_server_when_host_is_set(self):
+        """Test that a configured host switches to the HTTP client."""
+        with (
+            patch("telegram_bot.services.chroma_client.PersistentClient") as persistent,
+            patch("telegram_bot.services.chroma_client.HttpClient") as http,
+        ):
+            client = create_chroma_client(
+                "/tmp/chroma", host="chroma.internal", port=9000
+            )
+
+        assert client is http.return_value
+        assert http.call_args.kwargs["host"] == "chroma.internal"
+        assert http.call_args.kwargs["port"] == 9000
+        persistent.assert_not_called()
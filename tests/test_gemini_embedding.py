@@ -0,0 +1,110 @@
+"""Tests for the Gemini embedding function."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from telegram_bot.services.gemini_embedding import (
+    MAX_BATCH_SIZE,
+    GeminiEmbeddingFunction,
+    get_embedding_function,
+)
+
+
+def _fake_embed_content(model, contents, **kwargs):
+    """Return a one-dimensional embedding holding each input's length."""
+    return SimpleNamespace(
+        embeddings=[SimpleNamespace(values=[float(len(text))]) for text in contents]
+    )
+
+
+def _embedding_fn(**kwargs) -> GeminiEmbeddingFunction:
+    with patch("telegram_bot.services.gemini_embedding.genai.Client"):
+        embedding_fn = GeminiEmbeddingFunction(api_key="test-key", **kwargs)
+    embedding_fn.client = MagicMock()
+    embedding_fn.client.models.embed_content.side_effect = _fake_embed_content
+    return embedding_fn
+
+
+class TestGeminiEmbeddingFunction:
+    """Test the GeminiEmbeddingFunction class."""
+
+    def test_batches_inputs_and_keeps_order(self):
+        """Test that texts are embedded in batched requests, in input order."""
+        embedding_fn = _embedding_fn()
+        texts = ["x" * (i + 1) for i in range(MAX_BATCH_SIZE + 5)]
+
+        embeddings = embedding_fn(texts)
+
+        assert embeddings == [[float(len(text))] for text in texts]
+        assert embedding_fn.client.models.embed_content.call_count == 2
+
+    def test_repeated_texts_are_embedded_once(self):
+        """Test that duplicate texts share one embedding request slot."""
+        embedding_fn = _embedding_fn()
+
+        embeddings = embedding_fn(["abc", "de", " abc "])
+
+        assert embeddings == [[3.0], [2.0], [3.0]]
+        contents = embedding_fn.client.models.embed_content.call_args.kwargs["contents"]
+        assert contents == ["abc", "de"]
+
+    def test_blank_inputs_get_empty_embeddings(self):
+        """Test that blank texts are skipped without a request."""
+        embedding_fn = _embedding_fn()
+
+        assert embedding_fn(["", "abc", "   "]) == [[], [3.0], []]
+        assert embedding_fn.client.models.embed_content.call_count == 1
+
+    def test_failed_request_leaves_empty_embeddings(self):
+        """Test that a failed request yields empty embeddings instead of raising."""
+        embedding_fn = _embedding_fn()
+        embedding_fn.client.models.embed_content.side_effect = RuntimeError("quota")
+
+        assert embedding_fn(["abc", "de"]) == [[], []]
+
+    def test_failed_batch_only_empties_its_own_inputs(self):
+        """Test that one failed batch request leaves the other batches' embeddings intact."""
+        embedding_fn = _embedding_fn()
+
+        def embed_content(model, contents, **kwargs):
+            if "fail" in contents:
+                raise RuntimeError("quota")
+            return _fake_embed_content(model, contents)
+
+        embedding_fn.client.models.embed_content.side_effect = embed_content
+        texts = ["x" * (i + 1) for i in range(MAX_BATCH_SIZE)] + ["fail"]
+
+        embeddings = embedding_fn(texts)
+
+        assert embeddings[:MAX_BATCH_SIZE] == [
+            [float(len(text))] for text in texts[:MAX_BATCH_SIZE]
+        ]
+        assert embeddings[MAX_BATCH_SIZE] == []
+
+    def test_reduced_dimensions_are_requested_and_normalized(self):
+        """Test that truncated embeddings are requested and rescaled to unit length."""
+        embedding_fn = _embedding_fn(output_dimensionality=2)
+        embedding_fn.client.models.embed_content.side_effect = (
+            lambda model, contents, config: SimpleNamespace(
+                embeddings=[SimpleNamespace(values=[3.0, 4.0]) for _ in contents]
+            )
+        )
+
+        assert embedding_fn(["abc"]) == [[0.6, 0.8]]
+        config = embedding_fn.client.models.embed_content.call_args.kwargs["config"]
+        assert config.output_dimensionality == 2
+
+    def test_embedding_function_is_shared_per_settings(self):
+        """Test that services asking for the same settings get one shared instance."""
+        get_embedding_function.cache_clear()
+        with patch(
+            "telegram_bot.services.gemini_embedding.genai.Client"
+        ) as mock_client:
+            first = get_embedding_function("test-key", "text-embedding-004", None)
+            second = get_embedding_function("test-key", "text-embedding-004", None)
+            other = get_embedding_function("test-key", "text-embedding-004", 256)
+        get_embedding_function.cache_clear()
+
+        assert first is second
+        assert other is not first
+        assert mock_client.call_count == 2
@@ -0,0 +1,152 @@
+"""Tests for the Python diagram generator."""
+
+from unittest.mock import patch
+
+import networkx as nx
+import pytest
+
+from telegram_bot.services.python_diagram_generator import (
+    MAX_NODES,
+    PythonDiagramGenerator,
+    _entity_type,
+    _hierarchical_layout,
+    _hierarchy_edges,
+    _layered_layout,
+)
+
+
+class TestPythonDiagramGenerator:
+    """Test the PythonDiagramGenerator helpers."""
+
+    def test_tiny_layout_line(self):
+        """Two nodes are laid out on a horizontal line."""
+        pos = PythonDiagramGenerator._tiny_layout(["a", "b"])
+
+        assert pos == {"a": (0.0, 0.0), "b": (1.0, 0.0)}
+
+    def test_tiny_layout_triangle(self):
+        """Three nodes form a triangle with the first node at the apex."""
+        pos = PythonDiagramGenerator._tiny_layout(["root", "left", "right"])
+
+        assert pos["root"][1] > pos["left"][1]
+        assert pos["left"][1] == pos["right"][1]
+
+    def test_small_figure_for_tiny_diagrams(self):
+        """Tiny diagrams render onto the smaller figure."""
+        generator = PythonDiagramGenerator()
+
+        assert generator._figure_size_for(2) == generator.small_figure_size
+        assert generator._figure_size_for(10) == generator.figure_size
+
+    def test_hi_res_figure_size(self):
+        """The default canvas is 1280x720 and hi_res restores 1920x1080."""
+        assert PythonDiagramGenerator().figure_size == (12.8, 7.2)
+        assert PythonDiagramGenerator(hi_res=True).figure_size == (19.2, 10.8)
+
+    def test_cap_graph_keeps_highest_degree_nodes(self):
+        """Oversized graphs are pruned to MAX_NODES, keeping the hubs."""
+        G = nx.DiGraph()
+        G.add_edges_from(("hub", f"leaf{i}") for i in range(MAX_NODES + 50))
+
+        capped = PythonDiagramGenerator._cap_graph(G, "Test")
+
+        assert capped.number_of_nodes() == MAX_NODES
+        assert "hub" in capped
+
+    def test_large_graphs_get_large_canvas_and_full_dpi(self):
+        """Canvas size and DPI grow with the number of nodes."""
+        generator = PythonDiagramGenerator()
+
+        assert generator._figure_size_for(20) == generator.large_figure_size
+        assert generator._dpi_for(5) == generator.low_dpi
+        assert generator._dpi_for(50) == generator.dpi
+
+    def test_hierarchy_edges_flattens_nested_dicts_and_lists(self):
+        """Nested hierarchies become parent/child edges at every depth."""
+        edges = _hierarchy_edges(
+            "CEO", {"CTO": ["Dev1", "Dev2"], "CFO": {"Accounting": []}}
+        )
+
+        assert set(edges) == {
+            ("CEO", "CTO"),
+            ("CEO", "CFO"),
+            ("CTO", "Dev1"),
+            ("CTO", "Dev2"),
+            ("CFO", "Accounting"),
+        }
+
+    def test_target_resolution_sets_figure_size(self):
+        """An explicit target resolution maps to whole-pixel figure dimensions."""
+        generator = PythonDiagramGenerator(target_resolution="1600x900")
+
+        assert generator.figure_size == (16.0, 9.0)
+        assert generator.small_figure_size == (12.0, 6.75)
+        assert generator.large_figure_size == (24.0, 13.5)
+        assert PythonDiagramGenerator().small_figure_size == (9.6, 5.4)
+        assert PythonDiagramGenerator().large_figure_size == (19.2, 10.8)
+        assert PythonDiagramGenerator(target_resolution="1920x1080").node_scale == 1.0
+
+    def test_hierarchical_layout_places_levels_in_rows(self):
+        """Each BFS level gets its own row and children sit under their parent."""
+        G = nx.DiGraph(
+            _hierarchy_edges("CEO", {"CTO": ["Dev1", "Dev2"], "CFO": ["Acct"]})
+        )
+
+        pos = _hierarchical_layout(G, "CEO")
+
+        assert pos["CEO"] == (0.5, 0)
+        assert pos["Acct"][0] == pos["CFO"][0]
+        assert pos["CTO"][1] == pos["CFO"][1] == -1
+        assert pos["CTO"][0] < pos["CFO"][0]
+        assert pos["Dev1"][0] < pos["Dev2"][0] < pos["Acct"][0]
+
+    def test_layered_layout_orders_columns_topologically(self):
+        """Acyclic flowcharts get one column per topological generation."""
+        G = nx.DiGraph(
+            [
+                ("client", "gateway"),
+                ("gateway", "auth"),
+                ("gateway", "orders"),
+                ("orders", "db"),
+            ]
+        )
+
+        pos = _layered_layout(G)
+
+        assert [pos[node][0] for node in ("client", "gateway", "auth", "db")] == [
+            0,
+            1,
+            2,
+            3,
+        ]
+        assert pos["auth"][0] == pos["orders"][0]
+
+    def test_layered_layout_rejects_long_chains(self):
+        """Chains deeper than the layer limit fall back to other layouts."""
+        assert _layered_layout(nx.path_graph(20, create_using=nx.DiGraph)) is None
+
+    def test_empty_timeline_still_renders(self):
+        """An empty event list renders just the timeline axis."""
+        image = PythonDiagramGenerator()._render_timeline_diagram([], return_bytes=True)
+
+        assert image.startswith(b"\x89PNG")
+
+    def test_failed_encode_removes_output_file(self, tmp_path):
+        """A PNG encode error leaves no temporary file behind."""
+        generator = PythonDiagramGenerator()
+        with (
+            patch("tempfile.tempdir", str(tmp_path)),
+            patch("PIL.Image.Image.save", side_effect=OSError("disk full")),
+            pytest.raises(OSError),
+        ):
+            generator._save_figure(generator._new_figure(1)[0], "timeline diagram")
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_entity_type_keeps_keyword_priority(self):
+        """Entity types follow the database, service, cache, queue keyword order."""
+        assert _entity_type("memcachedb") == "database"
+        assert _entity_type("Redis") == "cache"
+        assert _entity_type("Orders API") == "service"
+        assert _entity_type("Kafka") == "queue"
+        assert _entity_type("Frontend") == "primary"
@@ -0,0 +1,135 @@
+"""Tests for the question answering service."""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from telegram_bot.services.question_answering_service import (
+    QuestionAnsweringService,
+    _select_passages,
+)
+
+
+@pytest.fixture
+def service():
+    """Create a service without a real AI model."""
+    with patch("telegram_bot.services.question_answering_service.create_ai_model"):
+        return QuestionAnsweringService()
+
+
+class TestQuestionAnsweringService:
+    """Test the QuestionAnsweringService class."""
+
+    @pytest.mark.asyncio
+    async def test_answer_question_prompt(self, service):
+        """Test that the prompt carries the transcript followed by the question."""
+        service.ai_model = AsyncMock()
+        service.ai_model.generate_text.return_value = " Bob owns the launch. "
+
+        answer = await service.answer_question_about_transcript(
+            "Speaker 0: Bob owns the launch.", "Who owns the launch?"
+        )
+
+        prompt = service.ai_model.generate_text.call_args.args[0]
+        assert answer == "Bob owns the launch."
+        assert prompt.index("Speaker 0: Bob owns the launch.") < prompt.index(
+            "**Question:** Who owns the launch?"
+        )
+        assert prompt.endswith("**Answer:**")
+        assert "excerpt" not in prompt
+
+    @pytest.mark.asyncio
+    async def test_trimmed_transcript_is_flagged_as_excerpt(self, service):
+        """Test that the model is told when only selected passages of the transcript are sent."""
+        service.ai_model = AsyncMock()
+        service.ai_model.generate_text.return_value = "Summary."
+        transcript = "\n\n".join(
+            f"Speaker 0: Paragraph {i} about the weather." for i in range(5000)
+        )
+
+        await service.answer_question_about_transcript(
+            transcript, "Summarize the meeting"
+        )
+
+        prompt = service.ai_model.generate_text.call_args.args[0]
+        assert "The transcript above is an excerpt" in prompt
+        assert prompt.endswith("**Answer:**")
+
+    @pytest.mark.asyncio
+    async def test_read_transcript_file(self, service, tmp_path):
+        """Test reading a transcript and picking up changes to the file."""
+        transcript = tmp_path / "transcript.txt"
+        transcript.write_text("Speaker 0: Hello.\n", encoding="utf-8")
+
+        assert (
+            await service.read_transcript_file(str(transcript)) == "Speaker 0: Hello."
+        )
+
+        transcript.write_text("Speaker 0: Hello again.\n", encoding="utf-8")
+
+        assert (
+            await service.read_transcript_file(str(transcript))
+            == "Speaker 0: Hello again."
+        )
+
+    @pytest.mark.asyncio
+    async def test_read_transcript_file_normalizes_crlf(self, service, tmp_path):
+        """Test that CRLF transcripts still split into paragraphs on blank lines."""
+        transcript = tmp_path / "transcript.txt"
+        transcript.write_bytes(
+            b"Speaker 0: Hello.\r\n\r\nSpeaker 1: The budget is approved.\r\n"
+        )
+
+        content = await service.read_transcript_file(str(transcript))
+
+        assert content == "Speaker 0: Hello.\n\nSpeaker 1: The budget is approved."
+        assert _select_passages(content, "budget", token_budget=12) == (
+            "Speaker 1: The budget is approved."
+        )
+
+    @pytest.mark.asyncio
+    async def test_read_transcript_file_missing(self, service, tmp_path):
+        """Test that a missing transcript returns None."""
+        assert await service.read_transcript_file(str(tmp_path / "missing.txt")) is None
+
+
+class TestSelectPassages:
+    """Test trimming long transcripts to the passages relevant to a question."""
+
+    def test_short_transcript_unchanged(self):
+        """Test that transcripts within the budget are sent in full."""
+        transcript = "Speaker 0: Hello.\n\nSpeaker 1: Hi."
+
+        assert _select_passages(transcript, "greeting") == transcript
+
+    def test_long_transcript_keeps_relevant_passages_in_order(self):
+        """Test that only the best-matching passages are kept, in transcript order."""
+        filler = [
+            f"Speaker 0: Filler paragraph number {i} about nothing." for i in range(50)
+        ]
+        filler[10] = "Speaker 1: The launch budget is ten thousand dollars."
+        filler[40] = "Speaker 0: We agreed the budget needs approval."
+
+        result = _select_passages(
+            "\n\n".join(filler), "What is the budget?", token_budget=30
+        )
+
+        assert "launch budget" in result
+        assert "budget needs approval" in result
+        assert result.index("launch budget") < result.index("budget needs approval")
+        assert len(result) <= 30 * 4
+
+    def test_single_paragraph_transcript_is_ranked_by_line(self):
+        """Test that a transcript without blank lines is trimmed by relevance, not cut off."""
+        lines = [
+            f"Speaker 0: Filler line number {i} about nothing." for i in range(2000)
+        ]
+        lines[1500] = "Speaker 1: The launch budget is ten thousand dollars."
+
+        result = _select_passages(
+            "\n".join(lines), "What is the budget?", token_budget=100
+        )
+
+        assert "launch budget" in result
+        assert "Filler line number 0 " not in result
+        assert len(result) <= 100 * 4
@@ -0,0 +1,48 @@
+"""Tests for the semantic RAG answer cache."""
+
+import pytest
+
+from telegram_bot.services.chroma_client import create_chroma_client
+from telegram_bot.services.rag_answer_cache import SemanticAnswerCache, answer_cache_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Answer cache backed by an embedded Chroma store in a temporary directory."""
+    return SemanticAnswerCache(
+        create_chroma_client(str(tmp_path / "chroma")), ttl_seconds=3600
+    )
+
+
+class TestSemanticAnswerCache:
+    """Test the SemanticAnswerCache class."""
+
+    def test_close_question_with_same_key_hits(self, cache):
+        """Test that a rephrased question with the same intent key reuses the answer."""
+        key = answer_cache_key(
+            "action_items", {"primary_project_norm": {"$in": ["core"]}}
+        )
+        cache.store(1, key, "What are the Core tasks?", [1.0, 0.0, 0.0], "Ship it.")
+
+        assert cache.lookup(1, key, [0.99, 0.05, 0.0]) == "Ship it."
+
+    def test_distant_question_or_other_key_misses(self, cache):
+        """Test that a different question, intent or filter does not reuse the answer."""
+        key = answer_cache_key("action_items", None)
+        cache.store(1, key, "What are my tasks?", [1.0, 0.0, 0.0], "Ship it.")
+
+        assert cache.lookup(1, key, [0.5, 0.5, 0.0]) is None
+        assert (
+            cache.lookup(1, answer_cache_key("general_question", None), [1.0, 0.0, 0.0])
+            is None
+        )
+        assert cache.lookup(2, key, [1.0, 0.0, 0.0]) is None
+
+    def test_clear_drops_cached_answers(self, cache):
+        """Test that clearing the user's cache forces a fresh answer."""
+        key = answer_cache_key("action_items", None)
+        cache.store(1, key, "What are my tasks?", [1.0, 0.0, 0.0], "Ship it.")
+
+        cache.clear(1)
+
+        assert cache.lookup(1, key, [1.0, 0.0, 0.0]) is None
@@ -0,0 +1,484 @@
+"""Tests for the RAG indexing service."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from telegram_bot.services.rag_indexing_service import (
+    _SEGMENTATION_SYSTEM_PROMPT,
+    EpisodeChunk,
+    EpisodePlanSegment,
+    RAGIndexingService,
+    _fingerprint,
+)
+from telegram_bot.services.rag_storage_service import RAGStorageService
+
+
+@pytest.fixture
+def settings(tmp_path):
+    """Settings stub pointing RAG storage at a temporary directory."""
+    return MagicMock(
+        temp_dir=str(tmp_path),
+        rag_db_path=str(tmp_path / "rag.sqlite3"),
+        rag_enable_default=False,
+        rag_embedding_model="text-embedding-004",
+        rag_chunk_size=400,
+        rag_chunk_overlap=80,
+        rag_index_workers=2,
+        rag_answer_cache_ttl=3600,
+    )
+
+
+@pytest.fixture
+def service(settings):
+    """Indexing service with mocked AI model, vector client and embeddings."""
+    with (
+        patch(
+            "telegram_bot.services.rag_indexing_service.get_settings",
+            return_value=settings,
+        ),
+        patch(
+            "telegram_bot.services.rag_storage_service.get_settings",
+            return_value=settings,
+        ),
+    ):
+        return RAGIndexingService(
+            client=MagicMock(),
+            ai_model=AsyncMock(),
+            storage=RAGStorageService(),
+            embedding_fn=MagicMock(
+                model_name="text-embedding-004", output_dimensionality=None
+            ),
+        )
+
+
+class TestRAGIndexingService:
+    """Test the RAGIndexingService class."""
+
+    @pytest.mark.asyncio
+    async def test_episode_summary_is_cached_by_text(self, service):
+        """Test that identical episode text is summarized only once."""
+        service.ai_model.generate_text.return_value = "Team agreed on the launch date."
+
+        first = await service._summarize_episode("Speaker 0: Let's launch on Friday.")
+        second = await service._summarize_episode("Speaker 0: Let's launch on Friday.")
+
+        assert first == second == "Team agreed on the launch date."
+        service.ai_model.generate_text.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_summaries_share_one_request(self, service):
+        """Test that identical episodes summarized at the same time make one LLM call."""
+        service.ai_model.generate_text.return_value = "Summary."
+
+        summaries = await asyncio.gather(
+            service._summarize_episode("Speaker 0: Same text."),
+            service._summarize_episode("Speaker 0: Same text."),
+        )
+
+        assert summaries == ["Summary.", "Summary."]
+        service.ai_model.generate_text.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_ingest_meeting_summarizes_missing_episodes(self, service):
+        """Test that every episode without a plan summary gets one before indexing."""
+        service.generate_segmentation_plan = AsyncMock(return_value=[])
+        service.ai_model.generate_text.return_value = "Summary."
+        service.index_chunks = AsyncMock()
+
+        episodes = await service.ingest_meeting(
+            1, "meeting-1", "Speaker 0: Hello there.", {}
+        )
+
+        assert [episode.summary for episode in episodes] == ["Summary."]
+        indexed = service.index_chunks.call_args.args[1]
+        assert indexed[0].summary == "Summary."
+
+    @pytest.mark.asyncio
+    async def test_segmentation_instructions_are_sent_as_system_prompt(self, service):
+        """Test that only the transcript varies in the segmentation user prompt."""
+        service.ai_model.generate_text.return_value = '{"episodes": []}'
+
+        await service.generate_segmentation_plan("meeting-1", "Speaker 0: Hello there.")
+
+        call = service.ai_model.generate_text.call_args
+        assert call.kwargs["system"] == _SEGMENTATION_SYSTEM_PROMPT
+        assert call.args[0].endswith("TRANSCRIPT:\nSpeaker 0: Hello there.")
+        assert "EXAMPLES" not in call.args[0]
+
+    @pytest.mark.asyncio
+    async def test_ingest_meeting_indexes_episodes_without_waiting_for_other_summaries(
+        self, service
+    ):
+        """Test that an episode with a plan summary is indexed while another is still summarizing."""
+        transcript = "First topic is settled. Second topic needs a summary."
+        service.generate_segmentation_plan = AsyncMock(
+            return_value=[
+                EpisodePlanSegment(
+                    1, "First", "Planned.", [], [], "First topic", "settled.", 0.9
+                ),
+                EpisodePlanSegment(
+                    2, "Second", "", [], [], "Second topic", "summary.", 0.9
+                ),
+            ]
+        )
+        indexed: list[str] = []
+        service.index_chunks = AsyncMock(
+            side_effect=lambda user_id, chunks: indexed.append(chunks[0].episode_id)
+        )
+
+        async def slow_summary(*args, **kwargs):
+            assert indexed == ["meeting-1:episode:0"]
+            return "Summary."
+
+        service.ai_model.generate_text.side_effect = slow_summary
+        service.answer_cache = MagicMock()
+
+        episodes = await service.ingest_meeting(1, "meeting-1", transcript, {})
+
+        assert [episode.summary for episode in episodes] == ["Planned.", "Summary."]
+        assert indexed == ["meeting-1:episode:0", "meeting-1:episode:1"]
+        service.client.get_or_create_collection.assert_called_once()
+        service.answer_cache.clear.assert_called_once_with(1)
+
+    @pytest.mark.asyncio
+    async def test_failed_episode_upsert_raises_after_others_finish(self, service):
+        """Test that one failed upsert is re-raised once every episode has been attempted."""
+        transcript = "First topic is settled. Second topic is open."
+        service.generate_segmentation_plan = AsyncMock(
+            return_value=[
+                EpisodePlanSegment(
+                    1,
+                    "First",
+                    "A.",
+                    [],
+                    [{"alias": "Core", "confidence": 0.9}],
+                    "First topic",
+                    "settled.",
+                    0.9,
+                ),
+                EpisodePlanSegment(
+                    2, "Second", "B.", [], [], "Second topic", "open.", 0.9
+                ),
+            ]
+        )
+        service.storage.upsert_projects = MagicMock()
+        indexed: list[str] = []
+
+        async def index_chunks(user_id, chunks):
+            if chunks[0].episode_id.endswith(":0"):
+                raise RuntimeError("upsert failed")
+            indexed.append(chunks[0].episode_id)
+
+        service.index_chunks = AsyncMock(side_effect=index_chunks)
+
+        with pytest.raises(RuntimeError, match="upsert failed"):
+            await service.ingest_meeting(1, "meeting-1", transcript, {})
+
+        assert indexed == ["meeting-1:episode:1"]
+        assert service.storage.upsert_projects.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_summary_does_not_abort_ingest(self, service):
+        """Test that an episode whose summary request raises is indexed without a summary."""
+        service.generate_segmentation_plan = AsyncMock(return_value=[])
+        service.ai_model.generate_text.side_effect = RuntimeError("rate limited")
+        service.index_chunks = AsyncMock()
+
+        episodes = await service.ingest_meeting(
+            1, "meeting-1", "Speaker 0: Hello there.", {}
+        )
+
+        assert [episode.summary for episode in episodes] == [""]
+        service.index_chunks.assert_awaited_once()
+
+    def test_segmentation_response_with_nan_is_parsed(self, service):
+        """Test that JSON orjson rejects, such as NaN confidences, still parses."""
+        plan = service._parse_segmentation_response(
+            '```json\n{"episodes": [{"title": "Intro", "confidence": NaN}]}\n```'
+        )
+
+        assert [segment.title for segment in plan] == ["Intro"]
+
+    def test_segmentation_response_fields_are_validated(self, service):
+        """Test that a bare list with null fields and non-object entries parses to typed segments."""
+        plan = service._parse_segmentation_response(
+            '[{"title": null, "start_anchor": null, "topics": null, "projects": ["x", {"alias": "A"}]}, "junk"]'
+        )
+
+        assert len(plan) == 1
+        assert plan[0].title == "Unnamed Episode"
+        assert plan[0].start_anchor == ""
+        assert plan[0].topics == []
+        assert plan[0].projects == [{"alias": "A", "confidence": 0.0}]
+
+    @pytest.mark.asyncio
+    async def test_long_transcript_is_segmented_in_windows(self, service):
+        """Test that long transcripts are segmented per window, renumbered, and gaps are kept."""
+        lines = [
+            f"Speaker 0: Topic {i} starts here and then wraps up.\n" for i in range(6)
+        ]
+        transcript = "".join(lines)
+
+        async def segment(prompt, **kwargs):
+            if "Topic 2" in prompt:
+                return ""
+            topic = "Topic 0" if "Topic 0" in prompt else "Topic 4"
+            return f'{{"episodes": [{{"order": 1, "title": "{topic}", "start_anchor": "{topic} starts"}}]}}'
+
+        service.ai_model.generate_text.side_effect = segment
+        with patch(
+            "telegram_bot.services.rag_indexing_service.SEGMENTATION_WINDOW_WORDS", 20
+        ):
+            plan = await service.generate_segmentation_plan("meeting-1", transcript)
+
+        assert service.ai_model.generate_text.await_count == 3
+        assert [segment.order for segment in plan] == [1, 2, 3]
+        assert [segment.title for segment in plan] == [
+            "Topic 0",
+            "Unsegmented part",
+            "Topic 4",
+        ]
+        assert plan[1].start_anchor.startswith("Speaker 0: Topic 2")
+        assert service.storage.get_segmentation_plan("meeting-1") is None
+
+    @pytest.mark.asyncio
+    async def test_episode_crossing_a_window_boundary_stays_one_segment(self, service):
+        """Test that windows overlap and an episode cut by a boundary is merged back."""
+        lines = [
+            f"Speaker 0: {topic} line {name} about the quarterly spend plan.\n"
+            for topic, name in [
+                ("budget", "zero"),
+                ("budget", "one"),
+                ("budget", "two"),
+                ("budget", "three"),
+                ("hiring", "four"),
+                ("hiring", "five"),
+            ]
+        ]
+        transcript = "".join(lines)
+
+        async def segment(prompt, **kwargs):
+            if "line zero" in prompt:
+                return '[{"title": "Budget", "topics": ["budget"], "start_anchor": "budget line zero"}]'
+            if "line four" in prompt:
+                return (
+                    '[{"title": "Budget wrap-up", "topics": ["budget"], "start_anchor": "budget line three",'
+                    ' "end_anchor": "hiring line four"},'
+                    ' {"title": "Hiring", "topics": ["hiring"], "start_anchor": "hiring line four"}]'
+                )
+            return '[{"title": "Budget review", "topics": ["budget"], "start_anchor": "budget line one"}]'
+
+        service.ai_model.generate_text.side_effect = segment
+        with patch(
+            "telegram_bot.services.rag_indexing_service.SEGMENTATION_WINDOW_WORDS", 20
+        ):
+            windows = service._segmentation_windows(transcript)
+            plan = await service.generate_segmentation_plan("meeting-1", transcript)
+
+        assert [transcript[w.start : w.body_start] for w in windows] == [
+            "",
+            lines[1],
+            lines[3],
+        ]
+        assert [segment.title for segment in plan] == ["Budget", "Hiring"]
+        assert [segment.order for segment in plan] == [1, 2]
+        assert plan[0].end_anchor == "hiring line four"
+        episodes = service._split_transcript_by_plan(transcript, plan)
+        assert len(episodes) == 2
+        assert "budget line one" in episodes[0].text
+        assert "budget line three" in episodes[0].text
+
+    def test_null_and_non_finite_confidences_get_defaults(self, service):
+        """Test that null or NaN episode and project confidences are replaced, not fatal."""
+        plan = service._parse_segmentation_response(
+            '[{"title": "A", "confidence": null, "projects": [{"alias": "Core", "confidence": null}]},'
+            ' {"title": "B", "confidence": NaN, "projects": [{"alias": "Web", "confidence": Infinity}]}]'
+        )
+
+        assert [segment.confidence for segment in plan] == [0.5, 0.5]
+        assert [segment.projects[0]["confidence"] for segment in plan] == [0.0, 0.0]
+
+    @pytest.mark.asyncio
+    async def test_cached_plan_with_null_confidences_is_validated(self, service):
+        """Test that a cached plan whose NaN confidences were stored as null still splits."""
+        transcript = "Core work is on track. Done."
+        service.storage.save_segmentation_plan(
+            "meeting-1",
+            _fingerprint(transcript),
+            [
+                {
+                    "order": 1,
+                    "title": "Core",
+                    "projects": [{"alias": "Core", "confidence": None}],
+                    "confidence": None,
+                },
+            ],
+        )
+
+        plan = await service.generate_segmentation_plan("meeting-1", transcript)
+        episodes = service._split_transcript_by_plan(transcript, plan)
+
+        service.ai_model.generate_text.assert_not_called()
+        assert episodes[0].project_affinity == {"Core": 0.0}
+
+    def test_legacy_cached_plan_with_nan_is_read(self, service):
+        """Test that plan rows written by json.dumps with NaN confidences still load."""
+        service.storage.save_segmentation_plan("meeting-1", "hash", [])
+        with service.storage._connect() as conn:
+            conn.execute(
+                "UPDATE rag_segmentation_cache SET plan_json=? WHERE meeting_id=?",
+                ('[{"title": "Intro", "confidence": NaN}]', "meeting-1"),
+            )
+
+        cached = service.storage.get_segmentation_plan("meeting-1")
+
+        assert cached["segments"][0]["title"] == "Intro"
+
+    def test_unreadable_cached_plan_is_a_miss(self, service):
+        """Test that a corrupt plan row is ignored instead of failing every later ingest."""
+        service.storage.save_segmentation_plan("meeting-1", "hash", [])
+        with service.storage._connect() as conn:
+            conn.execute(
+                "UPDATE rag_segmentation_cache SET plan_json=? WHERE meeting_id=?",
+                ("[{", "meeting-1"),
+            )
+
+        assert service.storage.get_segmentation_plan("meeting-1") is None
+
+    def test_split_transcript_by_plan_matches_anchors_case_insensitively(self, service):
+        """Test that episodes start at their anchors and never overlap earlier ones."""
+        transcript = (
+            "Intro talk here. Let's discuss the budget now. Budget is fine. "
+            "Let's discuss the budget again. We ship on Friday. Thanks all."
+        )
+        plan = [
+            EpisodePlanSegment(
+                1,
+                "Budget",
+                "",
+                [],
+                [],
+                "let's DISCUSS the budget",
+                "Budget is fine",
+                0.9,
+            ),
+            EpisodePlanSegment(
+                2,
+                "Budget again",
+                "",
+                [],
+                [],
+                "Let's discuss the budget",
+                "Thanks all",
+                0.9,
+            ),
+        ]
+
+        episodes = service._split_transcript_by_plan(transcript, plan)
+
+        assert len(episodes) == 2
+        assert episodes[0].end_char <= episodes[1].start_char
+        assert "Friday" in episodes[1].text
+
+    def test_anchor_fallback_respects_search_start(self, service):
+        """Test anchors in text whose lowercase form changes length skip already-assigned text."""
+        transcript = "İstanbul office. Budget talk. Budget talk again. wrap up."
+
+        start, end = service._find_anchor_positions(
+            transcript, "Budget talk", "WRAP UP", search_from=20
+        )
+
+        assert transcript[start:].startswith("Budget talk again")
+        assert transcript[end:] == "wrap up."
+
+    def test_unpunctuated_text_is_split_into_overlapping_chunks(self, service):
+        """Test that a run-on sentence is windowed instead of becoming one oversized chunk."""
+        text = " ".join(f"w{i}" for i in range(1000))
+
+        chunks = service._split_large_text_into_chunks(text, "m:episode:0")
+
+        word_lists = [chunk_text.split() for chunk_text, _ in chunks]
+        assert len(chunks) > 1
+        assert all(len(words) <= service.chunk_size for words in word_lists)
+        assert (
+            word_lists[0][-service.chunk_overlap :]
+            == word_lists[1][: service.chunk_overlap]
+        )
+        assert word_lists[-1][-1] == "w999"
+
+    @pytest.mark.asyncio
+    async def test_index_chunks_opens_collection_once(self, service):
+        """Test that repeated indexing reuses the opened collection."""
+        chunk = EpisodeChunk(
+            "m:episode:0:0", "Hello.", "", "m", "m:episode:0", None, None, {}, [], {}
+        )
+
+        await service.index_chunks(1, [chunk])
+        await service.index_chunks(1, [chunk])
+
+        service.client.get_or_create_collection.assert_called_once()
+        assert (
+            service.client.get_or_create_collection.return_value.upsert.call_count == 2
+        )
+
+    @pytest.mark.asyncio
+    async def test_sub_chunks_share_episode_metadata(self, service):
+        """Test that every sub-chunk carries its episode's project tags and its own fields."""
+        affinity = {"Piggy Bank": 0.4, "Platform": 0.9}
+        chunks = [
+            EpisodeChunk(
+                f"m:episode:0:{i}",
+                "Hello.",
+                "S",
+                "m",
+                "m:episode:0",
+                None,
+                None,
+                affinity,
+                ["a"],
+                {"sub_chunk_index": i},
+            )
+            for i in range(2)
+        ]
+
+        await service.index_chunks(1, chunks)
+
+        metadatas = service.client.get_or_create_collection.return_value.upsert.call_args.kwargs[
+            "metadatas"
+        ]
+        assert [meta["sub_chunk_index"] for meta in metadatas] == [0, 1]
+        assert all(meta["primary_project"] == "Platform" for meta in metadatas)
+        assert all(
+            meta["project_tags_norm"] == "platform,piggy_bank" for meta in metadatas
+        )
+        assert all(meta["project_piggy_bank_score"] == 0.4 for meta in metadatas)
+
+    @pytest.mark.asyncio
+    async def test_ingest_meetings_batch_indexes_all_chunks_together(self, service):
+        """Test that chunks from several meetings go into a single upsert."""
+        service.generate_segmentation_plan = AsyncMock(return_value=[])
+        service.ai_model.generate_text.return_value = "Summary."
+        service.answer_cache = MagicMock()
+
+        episodes = await service.ingest_meetings_batch(
+            1, [("m1", "Speaker 0: First.", {}), ("m2", "Speaker 0: Second.", {})]
+        )
+
+        assert set(episodes) == {"m1", "m2"}
+        upsert = service.client.get_or_create_collection.return_value.upsert
+        upsert.assert_called_once()
+        assert upsert.call_args.kwargs["ids"] == ["m1:episode:0:0", "m2:episode:0:0"]
+        service.answer_cache.clear.assert_called_once_with(1)
+
+    def test_ensure_namespace_rejects_mismatched_embeddings(self, service):
+        """Test that a collection built with other embedding settings is refused."""
+        service.client.get_or_create_collection.return_value.metadata = {
+            "user_id": "1",
+            "embedding_model": "text-embedding-004",
+            "embedding_dimensions": 256,
+        }
+
+        with pytest.raises(ValueError):
+            service.ensure_namespace(1)
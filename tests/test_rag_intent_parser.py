@@ -0,0 +1,107 @@
+"""Tests for the RAG intent parser."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from telegram_bot.services.rag_intent_parser import (
+    _INTENT_SYSTEM_PROMPT,
+    RAGIntentParser,
+)
+
+
+@pytest.fixture
+def parser():
+    """Intent parser with a mocked AI model."""
+    return RAGIntentParser(ai_model=AsyncMock())
+
+
+class TestRAGIntentParser:
+    """Test the RAGIntentParser class."""
+
+    @pytest.mark.asyncio
+    async def test_fenced_response_is_parsed(self, parser):
+        """Test that a markdown-wrapped intent is decoded into typed fields."""
+        parser.ai_model.generate_text.return_value = (
+            '```json\n{"intent": "action_items", "projects": [{"alias": "PiggyBank", "confidence": 0.9}], '
+            '"topics": ["tasks"], "follow_up": false, "confidence": 0.8}\n```'
+        )
+
+        intent = await parser.parse("What are the PiggyBank action items?")
+
+        assert intent.intent == "action_items"
+        assert intent.projects == [{"alias": "PiggyBank", "confidence": 0.9}]
+        assert intent.date_ranges == []
+        assert intent.confidence == 0.8
+        assert intent.uncertainty_reason is None
+
+    @pytest.mark.asyncio
+    async def test_null_and_malformed_fields_get_defaults(self, parser):
+        """Test that nulls and wrongly typed entries become declared defaults."""
+        parser.ai_model.generate_text.return_value = (
+            '{"intent": null, "projects": ["x", {"alias": "A"}], "topics": null, '
+            '"follow_up": "yes", "confidence": null}'
+        )
+
+        intent = await parser.parse("Anything about A?")
+
+        assert intent.intent == "general_question"
+        assert intent.projects == [{"alias": "A"}]
+        assert intent.topics == []
+        assert intent.follow_up is False
+        assert intent.confidence == 0.0
+
+    @pytest.mark.asyncio
+    async def test_non_object_response_falls_back(self, parser):
+        """Test that a response that is not an intent object yields the fallback intent."""
+        parser.ai_model.generate_text.return_value = '["action_items"]'
+
+        intent = await parser.parse("What are my tasks?")
+
+        assert intent.uncertainty_reason == "parse_error"
+        assert intent.confidence == 0.0
+
+    @pytest.mark.asyncio
+    async def test_repeated_message_uses_cached_intent(self, parser):
+        """Test that a confident intent is reused for the same message and previous intent."""
+        parser.ai_model.generate_text.return_value = (
+            '{"intent": "action_items", "confidence": 0.9}'
+        )
+
+        first = await parser.parse("What are my tasks?")
+        second = await parser.parse("What are my tasks?")
+        await parser.parse(
+            "What are my tasks?", {"previous_intent": {"intent": "project_summary"}}
+        )
+
+        assert first is second
+        assert parser.ai_model.generate_text.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_low_confidence_intent_is_not_cached(self, parser):
+        """Test that an unsure intent is parsed again on the next identical message."""
+        parser.ai_model.generate_text.return_value = (
+            '{"intent": "general_question", "confidence": 0.3}'
+        )
+
+        await parser.parse("Hmm?")
+        await parser.parse("Hmm?")
+
+        assert parser.ai_model.generate_text.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_instructions_are_sent_as_system_prompt(self, parser):
+        """Test that only the message and previous intent vary in the user prompt."""
+        parser.ai_model.generate_text.return_value = (
+            '{"intent": "general_question", "confidence": 0.9}'
+        )
+
+        await parser.parse(
+            "And for Platform?", {"previous_intent": {"intent": "action_items"}}
+        )
+
+        call = parser.ai_model.generate_text.call_args
+        assert call.kwargs["system"] == _INTENT_SYSTEM_PROMPT
+        assert call.args[0].startswith('Previous intent: {"intent": "action_items"}')
+        assert "And for Platform?" in call.args[0]
+        assert "EXAMPLES" not in call.args[0]
@@ -0,0 +1,121 @@
+"""Tests for the RAG query service."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from telegram_bot.services.rag_intent_parser import ParsedIntent
+from telegram_bot.services.rag_query_service import RAGQueryService
+
+
+def _intent(projects=None, date_ranges=None) -> ParsedIntent:
+    return ParsedIntent(
+        intent="general_question",
+        projects=projects or [],
+        date_ranges=date_ranges or [],
+        topics=[],
+        follow_up=False,
+        confidence=0.9,
+        uncertainty_reason=None,
+    )
+
+
+@pytest.fixture
+def service(tmp_path):
+    """Query service with mocked AI model, vector client and embeddings."""
+    settings = MagicMock(
+        temp_dir=str(tmp_path),
+        rag_embedding_model="text-embedding-004",
+        rag_retrieval_k=12,
+        rag_similarity_threshold=0.7,
+        rag_answer_cache_ttl=3600,
+    )
+    with patch(
+        "telegram_bot.services.rag_query_service.get_settings", return_value=settings
+    ):
+        return RAGQueryService(
+            client=MagicMock(), ai_model=AsyncMock(), embedding_fn=MagicMock()
+        )
+
+
+class TestRAGQueryService:
+    """Test the RAGQueryService class."""
+
+    def test_project_filter_matches_primary_or_scored_projects(self, service):
+        """Test that project filters use the indexing normalization and per-project score fields."""
+        where = service._build_filter(
+            _intent(projects=[{"alias": "Piggy-Bank", "confidence": 0.9}])
+        )
+
+        assert where == {
+            "$or": [
+                {"primary_project_norm": {"$in": ["piggy_bank"]}},
+                {"project_piggy_bank_score": {"$gte": 0.5}},
+            ]
+        }
+
+    def test_filters_are_combined_under_one_operator(self, service):
+        """Test that several conditions are wrapped in $and, as Chroma requires."""
+        where = service._build_filter(
+            _intent(
+                projects=[{"alias": "Core", "confidence": 0.9}],
+                date_ranges=[{"start": "2025-01-01"}],
+            )
+        )
+
+        assert list(where) == ["$and"]
+        assert where["$and"][1] == {"meeting_date": {"$gte": "2025-01-01"}}
+
+    def test_no_filter_without_confident_projects_or_dates(self, service):
+        """Test that low-confidence projects produce no filter."""
+        assert (
+            service._build_filter(
+                _intent(projects=[{"alias": "Core", "confidence": 0.2}])
+            )
+            is None
+        )
+
+    @pytest.mark.asyncio
+    async def test_answer_reuses_cached_answer_for_same_intent(self, service):
+        """Test that a cached answer skips retrieval and generation, and follow-ups bypass the cache."""
+        service.embedding_fn.return_value = [[1.0, 0.0]]
+        service.client.get_collection.return_value.metadata = {}
+        service.answer_cache = MagicMock(enabled=True)
+        service.answer_cache.lookup.return_value = "Cached answer."
+
+        answer = await service.answer(1, _intent(), "What did we decide?")
+
+        assert answer == "Cached answer."
+        service.client.get_collection.return_value.query.assert_not_called()
+        service.ai_model.generate_text.assert_not_called()
+
+        follow_up = _intent()
+        follow_up.follow_up = True
+        service.client.get_collection.return_value.query.return_value = {
+            "documents": [[]]
+        }
+        await service.answer(1, follow_up, "And then?")
+        service.answer_cache.lookup.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_question_is_embedded_once_for_cache_and_search(self, service):
+        """Test that the vector search reuses the embedding computed for the cache lookup."""
+        service.embedding_fn.return_value = [[1.0, 0.0]]
+        collection = service.client.get_collection.return_value
+        collection.metadata = {}
+        collection.query.return_value = {
+            "documents": [["We ship Friday."]],
+            "metadatas": [[{"meeting_date": "2025-01-01"}]],
+            "distances": [[0.2]],
+        }
+        service.answer_cache = MagicMock(enabled=True)
+        service.answer_cache.lookup.return_value = None
+        service.ai_model.generate_text.return_value = "Friday."
+
+        answer = await service.answer(1, _intent(), "When do we ship?")
+
+        assert answer == "Friday."
+        service.embedding_fn.assert_called_once_with(["When do we ship?"])
+        assert collection.query.call_args.kwargs["query_embeddings"] == [[1.0, 0.0]]
+        assert "query_texts" not in collection.query.call_args.kwargs
+        assert service.answer_cache.store.call_args.args[3] == [1.0, 0.0]